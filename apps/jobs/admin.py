@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['title', 'company', 'location', 'easy_apply', 'last_seen_at']
+    list_filter = ['easy_apply', 'actively_reviewing', 'last_seen_at']
+    search_fields = ['title', 'company', 'location', 'job_id']
+
+
+admin.site.register(Job, JobAdmin)
@@ -0,0 +1,92 @@
+import gzip
+import json
+import logging
+from itertools import islice
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+JOB_FIELDS = [
+    "title",
+    "company",
+    "location",
+    "posted",
+    "easy_apply",
+    "actively_reviewing",
+    "job_url",
+]
+DEFAULT_BATCH_SIZE = 1000
+LINKEDIN_JOB_URL = "https://www.linkedin.com/jobs/view/{job_id}/"
+
+
+def iter_records(path):
+    """
+    Jobs from a scraper output file: one JSON object per line (.jsonl,
+    .ndjson, optionally .gz) is streamed; anything else is read as a legacy
+    JSON array.
+
+    A JSONL file cut short by a crashed scraper (truncated gzip member,
+    unterminated last line) yields the records before the damage.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        if path.removesuffix(".gz").endswith((".jsonl", ".ndjson")):
+            try:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        if line.endswith("\n"):
+                            raise
+                        logger.warning("%s ends in a partial line, skipped it", path)
+                        return
+                    yield record
+            except (EOFError, gzip.BadGzipFile) as e:
+                logger.warning("%s is truncated, imported the readable part: %s", path, e)
+        else:
+            yield from json.load(f)
+
+
+def get_job_url(job_id):
+    # card links carry tracking query strings that can outgrow job_url
+    return LINKEDIN_JOB_URL.format(job_id=job_id)
+
+
+def upsert_batch(records):
+    """
+    Insert or update one batch in a single INSERT ... ON CONFLICT (job_id)
+    DO UPDATE statement. Returns the number of distinct jobs written.
+    """
+    # a statement may not touch the same row twice, keep the last copy
+    jobs = {}
+    for record in records:
+        if not record.get("job_id"):
+            continue
+        job_id = str(record["job_id"])
+        jobs[job_id] = Job(
+            job_id=job_id,
+            **{field: record.get(field) or Job._meta.get_field(field).get_default() for field in JOB_FIELDS},
+        )
+        jobs[job_id].job_url = get_job_url(job_id)
+    Job.objects.bulk_create(
+        jobs.values(),
+        update_conflicts=True,
+        unique_fields=["job_id"],
+        update_fields=JOB_FIELDS + ["last_seen_at"],
+    )
+    return len(jobs)
+
+
+def import_jobs(records, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Upsert an iterable of scraper records `batch_size` at a time; memory use
+    is bounded by one batch whatever the input size.
+    """
+    records = iter(records)
+    total = 0
+    while batch := list(islice(records, batch_size)):
+        total += upsert_batch(batch)
+    return total
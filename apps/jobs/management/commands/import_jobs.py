@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.jobs import importer
+
+
+class Command(BaseCommand):
+    help = 'Upsert scraped LinkedIn jobs (JSON array or JSONL files) into the Job table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='Scraper output files')
+        parser.add_argument('--batch-size', type=int, default=importer.DEFAULT_BATCH_SIZE,
+                            help='Jobs written per INSERT ... ON CONFLICT statement')
+
+    def handle(self, *args, **options):
+        for path in options['paths']:
+            try:
+                count = importer.import_jobs(importer.iter_records(path), batch_size=options['batch_size'])
+            except (OSError, EOFError, ValueError) as e:
+                raise CommandError(f'Could not import {path}: {e}')
+            self.stdout.write(self.style.SUCCESS(f'Imported {count} jobs from {path}'))
@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-18 11:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_id', models.CharField(max_length=32, unique=True)),
+                ('title', models.CharField(max_length=255)),
+                ('company', models.CharField(blank=True, max_length=255)),
+                ('location', models.CharField(blank=True, max_length=255)),
+                ('posted', models.CharField(blank=True, max_length=100)),
+                ('easy_apply', models.BooleanField(default=False)),
+                ('actively_reviewing', models.BooleanField(default=False)),
+                ('job_url', models.URLField(max_length=500)),
+                ('first_seen_at', models.DateTimeField(auto_now_add=True)),
+                ('last_seen_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import models
+
+
+class Job(models.Model):
+    """
+    A LinkedIn job posting collected by the scraper (see apps.jobs.importer).
+    """
+
+    job_id = models.CharField(max_length=32, unique=True)
+    title = models.CharField(max_length=255)
+    company = models.CharField(max_length=255, blank=True)
+    location = models.CharField(max_length=255, blank=True)
+    # relative text as shown on the card, e.g. "2 days ago"
+    posted = models.CharField(max_length=100, blank=True)
+    easy_apply = models.BooleanField(default=False)
+    actively_reviewing = models.BooleanField(default=False)
+    job_url = models.URLField(max_length=500)
+
+    first_seen_at = models.DateTimeField(auto_now_add=True)
+    last_seen_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.title} ({self.company})"
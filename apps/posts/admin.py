@@ -1,10 +1,24 @@
 from django.contrib import admin
 
 # Register your models here.
-from .models import Post
+from .models import Post, PostDelivery
+
+
+class PostDeliveryInline(admin.TabularInline):
+    model = PostDelivery
+    extra = 0
+    can_delete = False
+    fields = ['platform', 'state', 'attempts', 'remote_id', 'sent_at', 'last_error']
+    readonly_fields = fields
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
 
 class PostAdmin(admin.ModelAdmin):
     list_filter = ['updated_at',]
+    ordering = ['-updated_at']
+    inlines = [PostDeliveryInline]
     # list_display = ['content', 'updated_at']
 
     def get_list_display(self, request, *args, **kwargs):
@@ -40,4 +54,24 @@ class PostAdmin(admin.ModelAdmin):
         super().save_model(request, obj, form, change)
 
 
-admin.site.register(Post, PostAdmin)
\ No newline at end of file
+admin.site.register(Post, PostAdmin)
+
+
+class PostDeliveryAdmin(admin.ModelAdmin):
+    list_display = ['post', 'platform', 'state', 'attempts', 'remote_id', 'updated_at']
+    list_filter = ['platform', 'state']
+    list_select_related = ['post']
+    readonly_fields = ['post', 'platform', 'state', 'attempts', 'remote_id', 'last_error', 'started_at', 'sent_at']
+    actions = ['mark_not_published']
+
+    @admin.action(description="Mark as not published (allow a retry)")
+    def mark_not_published(self, request, queryset):
+        # only for deliveries someone checked on the platform by hand, or
+        # rejected ones whose cause was fixed (one more attempt)
+        updated = queryset.filter(
+            state__in=[PostDelivery.State.SENDING, PostDelivery.State.UNKNOWN, PostDelivery.State.REJECTED]
+        ).update(state=PostDelivery.State.FAILED)
+        self.message_user(request, f"{updated} deliveries will be retried.")
+
+
+admin.site.register(PostDelivery, PostDeliveryAdmin)
\ No newline at end of file
@@ -0,0 +1,20 @@
+from .models import Post
+
+POST_EXPORT_FIELDS = [
+    "id",
+    "user_id",
+    "user__email",
+    "content",
+    "share_now",
+    "share_at",
+    "share_on_linkedin",
+    "shared_at_linkedin",
+    "share_start_at",
+    "share_complete_at",
+    "created_at",
+    "updated_at",
+]
+
+
+def get_export_queryset():
+    return Post.objects.order_by("id")
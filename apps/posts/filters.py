@@ -0,0 +1,17 @@
+from django_filters import rest_framework as filters
+
+from .models import Post
+
+
+class PostFilter(filters.FilterSet):
+    """
+    - ?share_at_after=<iso>&share_at_before=<iso>  → share_at range
+    - ?shared=true|false                           → already on LinkedIn or not
+    """
+
+    share_at = filters.IsoDateTimeFromToRangeFilter()
+    shared = filters.BooleanFilter(field_name="shared_at_linkedin", lookup_expr="isnull", exclude=True)
+
+    class Meta:
+        model = Post
+        fields = ["share_at", "shared", "share_on_linkedin"]
@@ -0,0 +1,62 @@
+import logging
+import signal
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.posts import scheduler
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Publish posts whose share_at has passed. Safe to run in several processes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=scheduler.DEFAULT_BATCH_SIZE,
+                            help='Number of posts claimed per transaction')
+        parser.add_argument('--interval', type=float, default=5.0,
+                            help='Seconds to sleep when nothing is due')
+        parser.add_argument('--claim-timeout', type=int,
+                            default=int(scheduler.DEFAULT_CLAIM_TIMEOUT.total_seconds()),
+                            help='Seconds after which an unfinished claim is retried')
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the due posts once and exit')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        interval = options['interval']
+        claim_timeout = timedelta(seconds=options['claim_timeout'])
+        once = options['once']
+
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        self.stdout.write(self.style.SUCCESS('Dispatcher started.'))
+        while not self._stopping:
+            # drop connections that died (e.g. Postgres restarted) since the last batch
+            close_old_connections()
+            try:
+                claimed, shared = scheduler.dispatch_due_posts(
+                    batch_size=batch_size, claim_timeout=claim_timeout
+                )
+            except Exception:
+                # claimed posts are retried once their claim times out
+                logger.exception('Dispatch failed, retrying in %s seconds', interval)
+                if once:
+                    break
+                time.sleep(interval)
+                continue
+            if claimed:
+                self.stdout.write(f'Shared {shared}/{claimed} posts.')
+                continue
+            if once:
+                break
+            time.sleep(interval)
+        self.stdout.write(self.style.SUCCESS('Dispatcher stopped.'))
+
+    def _stop(self, signum, frame):
+        self._stopping = True
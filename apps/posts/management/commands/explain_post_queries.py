@@ -0,0 +1,95 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from datetime import timedelta
+
+from apps.posts import scheduler
+from apps.posts.models import Post
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Show query plans of the scheduler and per-user post queries with and '
+            'without the Post indexes. Everything runs in a rolled-back transaction, '
+            'which locks the posts table (reads too) until it ends: never run it '
+            'against production.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Insert this many synthetic posts first (rolled back)')
+        parser.add_argument('--analyze', action='store_true',
+                            help='Use EXPLAIN ANALYZE (executes the queries)')
+        parser.add_argument('--force', action='store_true',
+                            help='Run even though DEBUG is off')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Query plans are only meaningful on PostgreSQL.')
+        if not settings.DEBUG and not options['force']:
+            # dropping the indexes takes an ACCESS EXCLUSIVE lock on posts_post
+            raise CommandError(
+                'This blocks every read and write of posts until it finishes. '
+                'Run it on a development database, or pass --force.'
+            )
+
+        with transaction.atomic():
+            user = self.seed(options['seed']) if options['seed'] else User.objects.first()
+            if user is None:
+                raise CommandError('No users found, use --seed.')
+            with connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE {Post._meta.db_table}')
+
+            after = self.explain(user, options['analyze'])
+            with connection.schema_editor(atomic=False) as editor:
+                for index in Post._meta.indexes:
+                    editor.remove_index(Post, index)
+            before = self.explain(user, options['analyze'])
+
+            for name in after:
+                self.stdout.write(self.style.MIGRATE_HEADING(f'\n{name}'))
+                self.stdout.write(self.style.WARNING('-- without indexes'))
+                self.stdout.write(before[name])
+                self.stdout.write(self.style.SUCCESS('-- with indexes'))
+                self.stdout.write(after[name])
+
+            transaction.set_rollback(True)
+
+    def explain(self, user, analyze):
+        queries = {
+            'scheduler: due posts': (
+                scheduler.due_posts().order_by('share_at')[:scheduler.DEFAULT_BATCH_SIZE]
+            ),
+            'admin: posts of one user by updated_at': (
+                Post.objects.filter(user=user).order_by('-updated_at')[:100]
+            ),
+        }
+        return {
+            name: queryset.explain(analyze=analyze)
+            for name, queryset in queries.items()
+        }
+
+    def seed(self, count):
+        # a few heavy users with mostly shared history and a small due tail
+        users = [
+            User.objects.create_user(email=f'explain-{i}@example.com')
+            for i in range(10)
+        ]
+        now = timezone.now()
+        batch = []
+        for i in range(count):
+            shared = i % 100 != 0
+            batch.append(Post(
+                user=users[i % len(users)],
+                content=f'Synthetic post {i}',
+                share_at=now - timedelta(minutes=i),
+                share_on_linkedin=True,
+                shared_at_linkedin=now if shared else None,
+            ))
+            if len(batch) == 5000:
+                Post.objects.bulk_create(batch)
+                batch = []
+        Post.objects.bulk_create(batch)
+        return users[0]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-18 11:22
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction, and keeps
+    # posts writable while the indexes build on a large table.
+    atomic = False
+
+    dependencies = [
+        ('posts', '0002_ratelimitbucket'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='post',
+            index=models.Index(condition=models.Q(('share_on_linkedin', True), ('shared_at_linkedin__isnull', True)), fields=['share_at'], name='posts_post_due_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='post',
+            index=models.Index(fields=['user', 'updated_at'], name='posts_post_user_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2 on 2026-10-18 11:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_sent_deliveries(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    PostDelivery = apps.get_model('posts', 'PostDelivery')
+    shared = Post.objects.filter(shared_at_linkedin__isnull=False).values_list('pk', 'shared_at_linkedin')
+    batch = []
+    for post_id, shared_at in shared.iterator(chunk_size=2000):
+        batch.append(PostDelivery(
+            post_id=post_id, platform='linkedin', state='sent', attempts=1, sent_at=shared_at,
+        ))
+        if len(batch) == 2000:
+            PostDelivery.objects.bulk_create(batch)
+            batch = []
+    PostDelivery.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_post_user_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('platform', models.CharField(choices=[('linkedin', 'LinkedIn')], max_length=20)),
+                ('state', models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed'), ('unknown', 'Unknown')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('remote_id', models.CharField(blank=True, max_length=255)),
+                ('last_error', models.TextField(blank=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='posts.post')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('post', 'platform'), name='posts_delivery_post_platform_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_sent_deliveries, migrations.RunPython.noop),
+    ]
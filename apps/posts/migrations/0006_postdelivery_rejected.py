@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 12:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_postdelivery'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='postdelivery',
+            name='state',
+            field=models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed'), ('unknown', 'Unknown'), ('rejected', 'Rejected')], default='pending', max_length=20),
+        ),
+    ]
@@ -1,13 +1,34 @@
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.utils import timezone
 from datetime import timedelta
+from apps.tasks import queue
 from helper import linkedin
 
 User = settings.AUTH_USER_MODEL  # "auth.User"
 
 
+def share_error(exc):
+    if isinstance(exc, linkedin.ShareRejected):
+        return ValidationError({
+            "content": f"LinkedIn rejected the post ({exc.status_code}). It will not be retried."
+        })
+    if isinstance(exc, linkedin.ShareOutcomeUnknown):
+        return ValidationError({
+            "content": "LinkedIn did not confirm the share. It will not be retried automatically."
+        })
+    if isinstance(exc, linkedin.RateLimited):
+        return ValidationError({
+            "content": f"LinkedIn rate limit reached, try again in {int(exc.retry_after) + 1} seconds."
+        })
+    return ValidationError({
+        "content": "Could not share to LinkedIn."
+    })
+
+
 class Post(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     content = models.TextField()
@@ -24,7 +45,26 @@ class Post(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
-    def clean(self):
+    class Meta:
+        indexes = [
+            # scheduler.due_posts(): only the small unshared tail is indexed
+            models.Index(
+                fields=["share_at"],
+                name="posts_post_due_idx",
+                condition=models.Q(shared_at_linkedin__isnull=True, share_on_linkedin=True),
+            ),
+            # per-user listings ordered by last update (admin changelist)
+            models.Index(fields=["user", "updated_at"], name="posts_post_user_updated_idx"),
+            # keyset pagination of the posts API, see pagination.PostCursorPagination
+            models.Index(fields=["user", "-created_at", "-id"], name="posts_post_user_created_idx"),
+        ]
+
+    def clean(self, verify_linkedin_user=True):
+        """
+        `verify_linkedin_user=False` skips the per-user LinkedIn connection
+        check, for callers that already ran verify_user_can_share_on_linkedin()
+        once for a whole batch.
+        """
         super().clean()
 
         if self.share_now is None and self.share_at is None:
@@ -34,13 +74,14 @@ class Post(models.Model):
             })
 
         if self.share_on_linkedin:
-            self.verify_can_share_on_linkedin()
+            self.verify_can_share_on_linkedin(verify_user=verify_linkedin_user)
 
     def get_scheduled_platforms(self):
-        platforms = []
-        if self.share_on_linkedin:
-            platforms.append("linkedin")
-        return platforms
+        # every platform has a `share_on_<platform>` flag on the post
+        return [
+            platform for platform in PostDelivery.Platform.values
+            if getattr(self, f"share_on_{platform}", False)
+        ]
 
     def save(self, *args, **kwargs):
         # Pre-save logic
@@ -48,28 +89,116 @@ class Post(models.Model):
             self.share_at = timezone.now()
 
         super().save(*args, **kwargs)
-        # Post-save logic removed (Inngest)
+        # Post-save logic: publish in a task worker, never on the request thread
+        if "update_fields" not in kwargs and self.should_enqueue_share():
+            queue.enqueue_on_commit("posts.share_post", self.pk)
+
+    def should_enqueue_share(self):
+        return bool(self.share_now and self.share_on_linkedin and not self.shared_at_linkedin)
 
     def perform_share_on_linkedin(self, mock=False, save=False):
         if self.shared_at_linkedin:
             return self
 
-        if not mock:
-            try:
-                linkedin.post_to_linkedin(self.user, self.content)
-            except Exception:
-                raise ValidationError({
-                    "content": "Could not share to LinkedIn."
-                })
-
-        self.shared_at_linkedin = timezone.now()
+        errors = Post.perform_share_many_on_linkedin([self], mock=mock)
+        if self.pk in errors:
+            raise errors[self.pk]
 
         if save:
             self.save(update_fields=["shared_at_linkedin"])
 
         return self
 
-    def verify_can_share_on_linkedin(self):
+    @classmethod
+    def perform_share_many_on_linkedin(cls, posts, mock=False):
+        """
+        Share several posts concurrently. Successful posts get
+        `shared_at_linkedin` stamped (not saved); returns a dict mapping the
+        failed posts' pk to a ValidationError.
+
+        Each post is only sent by the caller that moved its PostDelivery to
+        "sending", so concurrent workers and retries never post twice.
+        """
+        pending = [post for post in posts if not post.shared_at_linkedin]
+        errors = {}
+        if not pending:
+            return errors
+
+        platform = PostDelivery.Platform.LINKEDIN
+        deliveries = PostDelivery.for_posts(pending, platform)
+        started = {delivery.post_id for delivery in PostDelivery.start_many(deliveries.values())}
+        for post in pending:
+            if post.pk in started:
+                continue
+            error = post.not_started_error(deliveries[post.pk])
+            if error:
+                errors[post.pk] = error
+
+        sending = [post for post in pending if post.pk in started]
+        if mock:
+            results = [linkedin.ShareResult(post.user, post.content) for post in sending]
+        else:
+            results = linkedin.post_many([(post.user, post.content) for post in sending])
+
+        for post, result in zip(sending, results):
+            delivery = deliveries[post.pk]
+            if result.ok:
+                remote_id = linkedin.get_share_urn(result.response) if result.response is not None else ""
+                delivery.mark_sent(remote_id)
+                post.shared_at_linkedin = delivery.sent_at
+            else:
+                delivery.mark_failed(result.error)
+                errors[post.pk] = share_error(result.error)
+        return errors
+
+    async def aperform_share_on_linkedin(self):
+        """
+        Share this post from an async view: same delivery bookkeeping as
+        perform_share_many_on_linkedin(), LinkedIn is called on the async
+        client. Saves the post.
+        """
+        if self.shared_at_linkedin:
+            return self
+
+        deliveries = await sync_to_async(PostDelivery.for_posts)([self], PostDelivery.Platform.LINKEDIN)
+        delivery = deliveries[self.pk]
+        if await sync_to_async(PostDelivery.start_many)([delivery]):
+            try:
+                response = await linkedin.apost_to_linkedin(self.user, self.content)
+            except Exception as e:
+                await sync_to_async(delivery.mark_failed)(e)
+                raise share_error(e)
+            await sync_to_async(delivery.mark_sent)(linkedin.get_share_urn(response))
+            self.shared_at_linkedin = delivery.sent_at
+        else:
+            error = self.not_started_error(delivery)
+            if error:
+                raise error
+
+        self.share_complete_at = timezone.now()
+        await self.asave(update_fields=["shared_at_linkedin", "share_complete_at", "updated_at"])
+        return self
+
+    def not_started_error(self, delivery):
+        """
+        Why `delivery` could not be started by this caller, or None if it was
+        already sent (then `shared_at_linkedin` is stamped from it).
+        """
+        if delivery.state == PostDelivery.State.SENT:
+            # published by an earlier run that died before saving the post
+            self.shared_at_linkedin = delivery.sent_at
+            return None
+        if delivery.state == PostDelivery.State.UNKNOWN:
+            return share_error(linkedin.ShareOutcomeUnknown())
+        if delivery.state == PostDelivery.State.REJECTED:
+            return ValidationError({
+                "content": f"Sharing to LinkedIn was given up: {delivery.last_error}"
+            })
+        return ValidationError({
+            "content": "This post is already being shared to LinkedIn."
+        })
+
+    def verify_can_share_on_linkedin(self, verify_user=True):
         if len(self.content) < 5:
             raise ValidationError({
                 "content": "Content must be at least 5 characters long."
@@ -81,8 +210,12 @@ class Post(models.Model):
                 "content": "Content is already shared on LinkedIn."
             })
 
+        if verify_user:
+            self.verify_user_can_share_on_linkedin()
+
+    def verify_user_can_share_on_linkedin(self):
         try:
-            linkedin.get_linkedin_user_details(self.user)
+            linkedin.get_share_credentials(self.user)
         except linkedin.UserNotConnectedLinkedIn:
             raise ValidationError({
                 "user": "You must connect LinkedIn before sharing."
@@ -91,3 +224,120 @@ class Post(models.Model):
             raise ValidationError({
                 "user": str(e)
             })
+
+
+class PostDelivery(models.Model):
+    """
+    Publishing state of one post on one platform. The state only changes
+    through conditional updates, so a post is handed to exactly one worker
+    and never sent again once the platform may have published it.
+    """
+
+    class Platform(models.TextChoices):
+        LINKEDIN = "linkedin", "LinkedIn"
+
+    class State(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENDING = "sending", "Sending"
+        SENT = "sent", "Sent"
+        # definitely not published, retried by the next dispatch
+        FAILED = "failed", "Failed"
+        # the request may have been published, left for an admin to resolve
+        UNKNOWN = "unknown", "Unknown"
+        # can't succeed (LinkedIn refused it, no usable connection) or out of
+        # attempts; left for an admin
+        REJECTED = "rejected", "Rejected"
+
+    STARTABLE = [State.PENDING, State.FAILED]
+
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="deliveries")
+    platform = models.CharField(max_length=20, choices=Platform.choices)
+    state = models.CharField(max_length=20, choices=State.choices, default=State.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    remote_id = models.CharField(max_length=255, blank=True)
+    last_error = models.TextField(blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["post", "platform"], name="posts_delivery_post_platform_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.post_id} on {self.platform} ({self.state})"
+
+    @classmethod
+    def for_posts(cls, posts, platform):
+        """
+        Get or create the deliveries of `posts` on `platform` with one insert
+        and one select. Returns {post_id: delivery}.
+        """
+        cls.objects.bulk_create(
+            [cls(post=post, platform=platform) for post in posts], ignore_conflicts=True
+        )
+        return {
+            delivery.post_id: delivery
+            for delivery in cls.objects.filter(post__in=posts, platform=platform)
+        }
+
+    @classmethod
+    def start_many(cls, deliveries):
+        """
+        Move pending/failed deliveries to "sending" under SKIP LOCKED row
+        locks. Returns the deliveries the caller now owns; anything else is
+        already sent, in flight or unresolved.
+        """
+        deliveries = list(deliveries)
+        now = timezone.now()
+        with transaction.atomic():
+            ids = set(
+                cls.objects.filter(pk__in=[d.pk for d in deliveries], state__in=cls.STARTABLE)
+                .select_for_update(skip_locked=True)
+                .values_list("pk", flat=True)
+            )
+            if ids:
+                cls.objects.filter(pk__in=ids).update(
+                    state=cls.State.SENDING, attempts=F("attempts") + 1,
+                    started_at=now, updated_at=now,
+                )
+        started = [d for d in deliveries if d.pk in ids]
+        for delivery in started:
+            delivery.state = cls.State.SENDING
+            delivery.attempts += 1
+            delivery.started_at = now
+        return started
+
+    def _finish(self, **fields):
+        fields["updated_at"] = timezone.now()
+        PostDelivery.objects.filter(pk=self.pk, state=self.State.SENDING).update(**fields)
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    def mark_sent(self, remote_id=""):
+        self._finish(state=self.State.SENT, remote_id=remote_id, sent_at=timezone.now(), last_error="")
+
+    def mark_failed(self, error):
+        if isinstance(error, linkedin.ShareOutcomeUnknown):
+            state = self.State.UNKNOWN
+        elif (isinstance(error, linkedin.PermanentShareError)
+                or self.attempts >= getattr(settings, "POST_DELIVERY_MAX_ATTEMPTS", 5)):
+            state = self.State.REJECTED
+        else:
+            state = self.State.FAILED
+        self._finish(state=state, last_error=str(error) or error.__class__.__name__)
+
+
+class RateLimitBucket(models.Model):
+    """
+    Token bucket state shared by every worker process, see helper.ratelimit.
+    """
+    key = models.CharField(max_length=255, unique=True)
+    tokens = models.FloatField()
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        return self.key
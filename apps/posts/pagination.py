@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class PostCursorPagination(CursorPagination):
+    """
+    Keyset pagination on (created_at, id): no OFFSET scan and no COUNT(*),
+    so deep pages cost the same as the first one.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = 100
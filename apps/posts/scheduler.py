@@ -0,0 +1,118 @@
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from helper import response_cache
+
+from .models import Post, PostDelivery
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50
+# A claim older than this is considered abandoned (crashed worker) and the
+# post becomes claimable again.
+DEFAULT_CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+def due_posts(now=None, claim_timeout=DEFAULT_CLAIM_TIMEOUT):
+    """
+    Posts that should be on LinkedIn by `now` and are not claimed by a worker.
+    Posts whose delivery may already be published (unknown outcome, or a
+    worker died while sending) or can't be published (rejected) wait for an
+    admin instead of being claimed again every `claim_timeout`.
+    """
+    now = now or timezone.now()
+    return Post.objects.filter(
+        share_on_linkedin=True,
+        shared_at_linkedin__isnull=True,
+        share_at__lte=now,
+    ).filter(
+        Q(share_start_at__isnull=True) | Q(share_start_at__lt=now - claim_timeout)
+    ).exclude(
+        deliveries__state__in=[
+            PostDelivery.State.SENDING, PostDelivery.State.UNKNOWN, PostDelivery.State.REJECTED,
+        ]
+    )
+
+
+def claim_due_posts(batch_size=DEFAULT_BATCH_SIZE, claim_timeout=DEFAULT_CLAIM_TIMEOUT):
+    """
+    Lock up to `batch_size` due posts with SKIP LOCKED and stamp
+    `share_start_at` so concurrent dispatchers never pick the same rows.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        posts = list(
+            due_posts(now, claim_timeout)
+            .select_for_update(skip_locked=True, of=("self",))
+            .select_related("user")
+            .order_by("share_at")[:batch_size]
+        )
+        if posts:
+            Post.objects.filter(pk__in=[post.pk for post in posts]).update(
+                share_start_at=now
+            )
+            for post in posts:
+                post.share_start_at = now
+            invalidate_cached_posts(posts)
+    return posts
+
+
+def claim_post(post_id, claim_timeout=DEFAULT_CLAIM_TIMEOUT):
+    """
+    Claim a single post if it is due and nobody else holds it. Returns the
+    post, or None if it was already shared or claimed.
+    """
+    now = timezone.now()
+    claimed = due_posts(now, claim_timeout).filter(pk=post_id).update(share_start_at=now)
+    if not claimed:
+        return None
+    post = Post.objects.select_related("user").get(pk=post_id)
+    invalidate_cached_posts([post])
+    return post
+
+
+def release_post(post, delay=0, claim_timeout=DEFAULT_CLAIM_TIMEOUT):
+    """
+    Drop a claim so the post can be picked up again after `delay` seconds
+    (right away by default).
+    """
+    share_start_at = None
+    if delay:
+        # the claim times out exactly `delay` seconds from now
+        share_start_at = timezone.now() + timedelta(seconds=delay) - claim_timeout
+    Post.objects.filter(pk=post.pk, share_start_at=post.share_start_at).update(share_start_at=share_start_at)
+    invalidate_cached_posts([post])
+
+
+def invalidate_cached_posts(posts):
+    # claims are stamped with update(), which sends no post_save
+    response_cache.invalidate(*{f"posts:{post.user_id}" for post in posts})
+
+
+def dispatch_posts(posts):
+    """
+    Share claimed posts concurrently. Failed posts keep their claim so they
+    are retried once the claim times out. Returns the number shared.
+    """
+    errors = Post.perform_share_many_on_linkedin(posts)
+    shared = 0
+    for post in posts:
+        if post.pk in errors:
+            logger.warning("Could not share post %s: %s", post.pk, errors[post.pk])
+            continue
+        post.share_complete_at = timezone.now()
+        post.save(update_fields=["shared_at_linkedin", "share_complete_at", "updated_at"])
+        shared += 1
+    return shared
+
+
+def dispatch_due_posts(batch_size=DEFAULT_BATCH_SIZE, claim_timeout=DEFAULT_CLAIM_TIMEOUT):
+    """
+    Claim and share one batch. Returns (claimed, shared) counts.
+    """
+    posts = claim_due_posts(batch_size=batch_size, claim_timeout=claim_timeout)
+    return len(posts), dispatch_posts(posts)
@@ -0,0 +1,86 @@
+import copy
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from apps.tasks import queue
+from helper import response_cache
+
+from .models import Post
+
+
+class PostListSerializer(serializers.ListSerializer):
+    def create(self, validated_data):
+        """
+        Insert all posts with one bulk_create. Post.save() is bypassed, so its
+        share_now stamping and share enqueueing are repeated here.
+        """
+        user = self.context["request"].user
+        now = timezone.now()
+        posts = []
+        for attrs in validated_data:
+            post = Post(user=user, **attrs)
+            if post.share_now:
+                post.share_at = now
+            posts.append(post)
+        posts = Post.objects.bulk_create(
+            posts, batch_size=getattr(settings, "POSTS_BULK_BATCH_SIZE", 500)
+        )
+        # bulk_create sends no post_save
+        response_cache.invalidate(f"posts:{user.pk}")
+        to_share = [(post.pk,) for post in posts if post.should_enqueue_share()]
+        if to_share:
+            transaction.on_commit(lambda: queue.enqueue_many("posts.share_post", to_share))
+        return posts
+
+
+class PostSerializer(serializers.ModelSerializer):
+    user_email = serializers.EmailField(source="user.email", read_only=True)
+
+    class Meta:
+        model = Post
+        list_serializer_class = PostListSerializer
+        fields = (
+            "id",
+            "user",
+            "user_email",
+            "content",
+            "share_now",
+            "share_at",
+            "share_on_linkedin",
+            "shared_at_linkedin",
+            "share_start_at",
+            "share_complete_at",
+            "created_at",
+            "updated_at",
+        )
+        read_only_fields = (
+            "user",
+            "shared_at_linkedin",
+            "share_start_at",
+            "share_complete_at",
+            "created_at",
+            "updated_at",
+        )
+
+    def validate(self, attrs):
+        """
+        Run Post.clean() so the API enforces the same rules as the admin.
+        Set `linkedin_user_verified` in the context to skip the per-user
+        LinkedIn check when the caller already did it once for a batch.
+        """
+        instance = self.instance or Post(user=self.context["request"].user)
+        if instance.shared_at_linkedin:
+            raise serializers.ValidationError("Shared posts can't be changed.")
+
+        post = copy.copy(instance)
+        for field, value in attrs.items():
+            setattr(post, field, value)
+        try:
+            post.clean(verify_linkedin_user=not self.context.get("linkedin_user_verified"))
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.message_dict)
+        return attrs
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from helper import response_cache
+
+from .models import Post
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_cached_posts(sender, instance, **kwargs):
+    response_cache.invalidate(f"posts:{instance.user_id}")
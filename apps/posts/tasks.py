@@ -0,0 +1,21 @@
+from apps.tasks import queue
+from apps.tasks.queue import task
+
+from . import scheduler
+
+
+@task("posts.share_post")
+def share_post(post_id):
+    """
+    Publish one post off the request thread. A post that is already shared or
+    being shared by another worker (or the dispatcher) is skipped.
+    """
+    post = scheduler.claim_post(post_id)
+    if post is None:
+        return
+    if not scheduler.dispatch_posts([post]):
+        # hand the post back when the task queue retries it, so neither the
+        # dispatcher nor the retry picks it up before the backoff is over
+        t = queue.current_task()
+        scheduler.release_post(post, delay=(t and queue.get_retry_delay(t)) or 0)
+        raise Exception(f"Could not share post {post_id} to LinkedIn.")
@@ -1,3 +1,189 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import httpx
+import requests
+import urllib3
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.tasks import queue
+from apps.tasks.models import Task
+from helper import linkedin
+
+from . import scheduler
+from .models import Post, PostDelivery
+
+
+def connection_error(reason):
+    # what requests raises once urllib3 gave up on a request
+    return requests.ConnectionError(urllib3.exceptions.MaxRetryError(None, "/v2/ugcPosts", reason))
+
+
+class MayHaveBeenSentTests(TestCase):
+    def test_errors_before_sending(self):
+        for exc in [
+            connection_error(urllib3.exceptions.NewConnectionError(None, "Connection refused")),
+            connection_error(urllib3.exceptions.NameResolutionError("api.linkedin.com", None, "DNS")),
+            requests.ConnectTimeout(),
+            requests.exceptions.SSLError(),
+            httpx.ConnectError("Connection refused"),
+            httpx.ConnectTimeout("timed out"),
+            httpx.PoolTimeout("pool full"),
+        ]:
+            with self.subTest(exc=exc):
+                self.assertFalse(linkedin.may_have_been_sent(exc))
+
+    def test_errors_after_sending(self):
+        for exc in [
+            requests.ReadTimeout(),
+            connection_error(urllib3.exceptions.ProtocolError("Connection reset by peer")),
+            httpx.ReadTimeout("timed out"),
+            httpx.RemoteProtocolError("Server disconnected"),
+        ]:
+            with self.subTest(exc=exc):
+                self.assertTrue(linkedin.may_have_been_sent(exc))
+
+
+@mock.patch("helper.linkedin.ratelimit.acquire")
+@mock.patch("helper.linkedin.get_session")
+class ShareOnLinkedInTests(TestCase):
+    def share(self):
+        return linkedin.share_on_linkedin("member", {}, "Hello LinkedIn")
+
+    def test_refused_connection_is_a_failure(self, get_session, acquire):
+        get_session.return_value.post.side_effect = connection_error(
+            urllib3.exceptions.NewConnectionError(None, "Connection refused")
+        )
+        with self.assertRaises(requests.ConnectionError):
+            self.share()
+
+    def test_read_timeout_is_unknown(self, get_session, acquire):
+        get_session.return_value.post.side_effect = requests.ReadTimeout()
+        with self.assertRaises(linkedin.ShareOutcomeUnknown):
+            self.share()
+
+    def test_client_error_is_rejected(self, get_session, acquire):
+        get_session.return_value.post.return_value = mock.Mock(status_code=422, text="Duplicate content")
+        with self.assertRaises(linkedin.ShareRejected) as cm:
+            self.share()
+        self.assertEqual(cm.exception.status_code, 422)
+        self.assertEqual(str(cm.exception), "LinkedIn responded 422: Duplicate content")
+
+    def test_unavailable_is_a_failure(self, get_session, acquire):
+        get_session.return_value.post.return_value = mock.Mock(status_code=503)
+        with self.assertRaises(linkedin.ShareFailed) as cm:
+            self.share()
+        self.assertNotIsInstance(cm.exception, linkedin.PermanentShareError)
+
+    def test_server_error_is_unknown(self, get_session, acquire):
+        get_session.return_value.post.return_value = mock.Mock(status_code=502)
+        with self.assertRaises(linkedin.ShareOutcomeUnknown):
+            self.share()
+
+
+class PostDeliveryTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create(email="author@example.com")
+        self.post = Post.objects.create(
+            user=self.user,
+            content="Hello LinkedIn",
+            share_at=timezone.now() - timedelta(minutes=1),
+            share_on_linkedin=True,
+        )
+
+    def share(self, error=None):
+        if error:
+            result = linkedin.ShareResult(self.user, self.post.content, error=error)
+        else:
+            response = mock.Mock(headers={"x-restli-id": "urn:li:share:1"})
+            result = linkedin.ShareResult(self.user, self.post.content, response=response)
+        with mock.patch("helper.linkedin.post_many", return_value=[result]) as post_many:
+            errors = Post.perform_share_many_on_linkedin([self.post])
+        return errors, post_many
+
+    def get_delivery(self):
+        return PostDelivery.objects.get(post=self.post, platform=PostDelivery.Platform.LINKEDIN)
+
+    def test_sent(self):
+        errors, _ = self.share()
+        self.assertEqual(errors, {})
+        delivery = self.get_delivery()
+        self.assertEqual(delivery.state, PostDelivery.State.SENT)
+        self.assertEqual(delivery.remote_id, "urn:li:share:1")
+        self.assertEqual(self.post.shared_at_linkedin, delivery.sent_at)
+
+    def test_sent_delivery_is_not_sent_again(self):
+        self.share()
+        self.post.shared_at_linkedin = None
+        errors, post_many = self.share()
+        self.assertEqual(errors, {})
+        self.assertEqual(post_many.call_args.args[0], [])
+        self.assertIsNotNone(self.post.shared_at_linkedin)
+
+    def test_failure_is_retried(self):
+        errors, _ = self.share(connection_error(urllib3.exceptions.NewConnectionError(None, "refused")))
+        self.assertIn(self.post.pk, errors)
+        self.assertEqual(self.get_delivery().state, PostDelivery.State.FAILED)
+
+        errors, post_many = self.share()
+        self.assertEqual(len(post_many.call_args.args[0]), 1)
+        delivery = self.get_delivery()
+        self.assertEqual(delivery.state, PostDelivery.State.SENT)
+        self.assertEqual(delivery.attempts, 2)
+
+    def test_rejected_is_not_retried(self):
+        errors, _ = self.share(linkedin.ShareRejected(422, "Duplicate content"))
+        self.assertIn(self.post.pk, errors)
+        delivery = self.get_delivery()
+        self.assertEqual(delivery.state, PostDelivery.State.REJECTED)
+        self.assertEqual(delivery.last_error, "LinkedIn responded 422: Duplicate content")
+        self.assertFalse(scheduler.due_posts().filter(pk=self.post.pk).exists())
+
+        errors, post_many = self.share()
+        self.assertIn(self.post.pk, errors)
+        self.assertEqual(post_many.call_args.args[0], [])
+
+    @override_settings(POST_DELIVERY_MAX_ATTEMPTS=2)
+    def test_failures_are_given_up_after_max_attempts(self):
+        self.share(linkedin.ShareFailed(503))
+        self.assertEqual(self.get_delivery().state, PostDelivery.State.FAILED)
+        self.share(linkedin.ShareFailed(503))
+        delivery = self.get_delivery()
+        self.assertEqual(delivery.state, PostDelivery.State.REJECTED)
+        self.assertEqual(delivery.last_error, "LinkedIn responded 503")
+
+    def test_unknown_outcome_waits_for_an_admin(self):
+        errors, _ = self.share(linkedin.ShareOutcomeUnknown("read timeout"))
+        self.assertIn(self.post.pk, errors)
+        self.assertEqual(self.get_delivery().state, PostDelivery.State.UNKNOWN)
+
+        errors, post_many = self.share()
+        self.assertIn(self.post.pk, errors)
+        self.assertEqual(post_many.call_args.args[0], [])
+        # not claimed again after every claim timeout
+        self.assertFalse(scheduler.due_posts().filter(pk=self.post.pk).exists())
+
+        # PostDeliveryAdmin.mark_not_published
+        PostDelivery.objects.filter(pk=self.get_delivery().pk).update(state=PostDelivery.State.FAILED)
+        self.assertTrue(scheduler.due_posts().filter(pk=self.post.pk).exists())
+
+
+class SharePostTaskTests(TestCase):
+    def test_failed_share_keeps_the_claim_until_the_retry(self):
+        user = get_user_model().objects.create(email="author@example.com")
+        post = Post.objects.create(
+            user=user, content="Hello LinkedIn", share_at=timezone.now(), share_on_linkedin=True
+        )
+        queue.enqueue("posts.share_post", post.pk, max_attempts=3)
+        [t] = queue.claim()
+
+        error = linkedin.ShareResult(user, post.content, error=requests.ConnectTimeout())
+        with mock.patch("helper.linkedin.post_many", return_value=[error]):
+            self.assertFalse(queue.run(t))
+
+        t.refresh_from_db()
+        self.assertEqual(t.state, Task.State.QUEUED)
+        self.assertFalse(scheduler.due_posts().filter(pk=post.pk).exists())
+        self.assertTrue(scheduler.due_posts(now=t.run_at + timedelta(seconds=1)).filter(pk=post.pk).exists())
@@ -0,0 +1,15 @@
+from django.urls import path
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.routers import SimpleRouter
+
+from .views import PostExportView, PostPublishView, PostViewSet
+
+router = SimpleRouter()
+router.register("posts", PostViewSet, basename="posts")
+
+urlpatterns = [
+    # before the router so "export" isn't taken for a post id
+    path("posts/export/", PostExportView.as_view(), name="posts_export"),
+    # token authenticated only, see helper.asyncapi
+    path("posts/<int:pk>/publish/", csrf_exempt(PostPublishView.as_view()), name="posts_publish"),
+] + router.urls
@@ -1,3 +1,143 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import JsonResponse
+from django.views import View
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from helper import export
+from helper.asyncapi import error_response, login_required
+from helper.db_router import replica_reads
+from helper.response_cache import cache_response
+
+from .exports import POST_EXPORT_FIELDS, get_export_queryset
+from .filters import PostFilter
+from .models import Post
+from .pagination import PostCursorPagination
+from .serializers import PostSerializer
+
+
+class PostViewSet(viewsets.ModelViewSet):
+    """
+    API endpoint for the current user's posts:
+    - GET /posts/        → List own posts (cursor paginated, filterable)
+    - POST /posts/       → Create a post
+    - GET /posts/<id>/   → Retrieve / update / delete one post
+    - POST /posts/bulk/  → Create many posts at once
+    """
+
+    serializer_class = PostSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = PostCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = PostFilter
+
+    def get_queryset(self):
+        return Post.objects.filter(user=self.request.user).select_related("user")
+
+    # invalidated by apps.posts.signals whenever one of the user's posts changes
+    @cache_response("posts:{user.pk}")
+    @replica_reads
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cache_response("posts:{user.pk}")
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    def perform_destroy(self, instance):
+        if instance.shared_at_linkedin:
+            raise PermissionDenied("Shared posts can't be deleted.")
+        instance.delete()
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Validate a list of posts together and insert them with one
+        bulk_create. Accepts a JSON list or {"posts": [...]}. Nothing is
+        created unless every item is valid; errors are returned per item, in
+        request order.
+        """
+        items = request.data.get("posts") if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list):
+            return Response(
+                {"posts": ["Expected a list of posts."]}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = self.get_serializer(
+            data=items,
+            many=True,
+            allow_empty=False,
+            max_length=getattr(settings, "POSTS_BULK_MAX_ITEMS", 1000),
+            context={**self.get_serializer_context(), "linkedin_user_verified": True},
+        )
+        if not serializer.is_valid():
+            errors = serializer.errors
+            if isinstance(errors, dict):  # list-level error (empty, too long)
+                return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        # the LinkedIn connection belongs to the user, not to a post: check
+        # once, on the parsed share_on_linkedin values
+        sharing = [bool(attrs.get("share_on_linkedin")) for attrs in serializer.validated_data]
+        if any(sharing):
+            try:
+                Post(user=request.user).verify_user_can_share_on_linkedin()
+            except DjangoValidationError as e:
+                errors = [e.message_dict if shares else {} for shares in sharing]
+                return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class PostPublishView(View):
+    """
+    API endpoint to publish one of the current user's posts right now (async):
+    - POST /posts/<id>/publish/  → Share on LinkedIn, wait for the result
+
+    The request waits on LinkedIn on the event loop, so under ASGI one
+    process keeps many of these in flight.
+    """
+
+    @login_required
+    async def post(self, request, pk, *args, **kwargs):
+        try:
+            post = await Post.objects.select_related("user").aget(pk=pk, user=request.user)
+        except Post.DoesNotExist:
+            return error_response("Not found.", status=status.HTTP_404_NOT_FOUND)
+        if not post.share_on_linkedin:
+            return error_response(
+                {"share_on_linkedin": ["This post is not set to be shared on LinkedIn."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            post.verify_can_share_on_linkedin(verify_user=False)
+            await post.aperform_share_on_linkedin()
+        except DjangoValidationError as e:
+            return error_response(e.message_dict, status=status.HTTP_400_BAD_REQUEST)
+        return JsonResponse(PostSerializer(post).data)
+
+
+class PostExportView(APIView):
+    """
+    API endpoint for admins to download every post:
+    - GET /posts/export/?output=ndjson|csv  → Streamed, constant memory
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        fmt = request.query_params.get("output", "ndjson")
+        if fmt not in export.FORMATS:
+            raise ValidationError({"output": f"Expected one of: {', '.join(export.FORMATS)}."})
+        return export.streaming_export_response(
+            get_export_queryset(), POST_EXPORT_FIELDS, fmt, "posts", request=request
+        )
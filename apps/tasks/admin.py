@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from .models import Task
+
+
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ['name', 'queue', 'state', 'attempts', 'run_at', 'updated_at']
+    list_filter = ['state', 'queue', 'name']
+    readonly_fields = ['locked_at', 'locked_by', 'last_error', 'created_at', 'updated_at']
+
+
+admin.site.register(Task, TaskAdmin)
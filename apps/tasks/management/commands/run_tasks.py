@@ -0,0 +1,42 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.tasks import queue
+
+
+class Command(BaseCommand):
+    help = 'Run queued background tasks. Safe to run in several processes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queue', type=str, default='default', help='Queue to consume')
+        parser.add_argument('--batch-size', type=int, default=10,
+                            help='Number of tasks claimed per transaction')
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the queue once and exit')
+
+    def handle(self, *args, **options):
+        worker_id = queue.get_worker_id()
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        self.stdout.write(self.style.SUCCESS(f'Task worker {worker_id} started on "{options["queue"]}".'))
+        while not self._stopping:
+            close_old_connections()
+            tasks = queue.claim(options['queue'], batch_size=options['batch_size'], worker_id=worker_id)
+            for t in tasks:
+                queue.run(t)
+            if tasks:
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS('Task worker stopped.'))
+
+    def _stop(self, signum, frame):
+        self._stopping = True
@@ -0,0 +1,215 @@
+import contextvars
+import logging
+import os
+import socket
+import threading
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+_current_task = contextvars.ContextVar("current_task", default=None)
+
+
+class UnknownTask(Exception):
+    pass
+
+
+def task(name):
+    """
+    Register a function as a task:
+
+        @task("posts.share_post")
+        def share_post(post_id): ...
+
+    Arguments and the return value (kept in Task.result) must be JSON
+    serializable. Raising makes the task retry with exponential backoff until
+    it runs out of attempts.
+    """
+    def decorator(func):
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def get_task(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise UnknownTask(name)
+
+
+def enqueue(name, *args, queue="default", run_at=None, max_attempts=None, **kwargs):
+    return Task.objects.create(
+        name=name,
+        queue=queue,
+        args=list(args),
+        kwargs=kwargs,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or getattr(settings, "TASKS_MAX_ATTEMPTS", 5),
+    )
+
+
+def enqueue_many(name, args_list, queue="default"):
+    """
+    Enqueue one task per args tuple with a single INSERT.
+    """
+    now = timezone.now()
+    max_attempts = getattr(settings, "TASKS_MAX_ATTEMPTS", 5)
+    return Task.objects.bulk_create([
+        Task(name=name, queue=queue, args=list(args), run_at=now, max_attempts=max_attempts)
+        for args in args_list
+    ])
+
+
+def enqueue_on_commit(name, *args, **kwargs):
+    """
+    Enqueue once the current transaction commits, so a worker never picks up
+    a task for rows it can't see yet (or that were rolled back).
+    """
+    transaction.on_commit(lambda: enqueue(name, *args, **kwargs))
+
+
+def get_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def get_lock_timeout():
+    return getattr(settings, "TASKS_LOCK_TIMEOUT", 600)
+
+
+def claim(queue="default", batch_size=10, worker_id=None):
+    """
+    Lock up to `batch_size` runnable tasks with SKIP LOCKED and mark them
+    running. A running task whose lock was not refreshed (see heartbeat())
+    for TASKS_LOCK_TIMEOUT seconds lost its worker: it is claimed again, or
+    failed if it is out of attempts.
+    """
+    now = timezone.now()
+    worker_id = worker_id or get_worker_id()
+    stale = Q(state=Task.State.RUNNING, locked_at__lt=now - timedelta(seconds=get_lock_timeout()))
+    with transaction.atomic():
+        Task.objects.filter(stale, queue=queue, attempts__gte=F("max_attempts")).update(
+            state=Task.State.FAILED, locked_at=None,
+            last_error="The worker running this task stopped responding.", updated_at=now,
+        )
+        tasks = list(
+            Task.objects.filter(queue=queue)
+            .filter(
+                Q(state=Task.State.QUEUED, run_at__lte=now)
+                | (stale & Q(attempts__lt=F("max_attempts")))
+            )
+            .select_for_update(skip_locked=True)
+            .order_by("run_at")[:batch_size]
+        )
+        if tasks:
+            Task.objects.filter(pk__in=[t.pk for t in tasks]).update(
+                state=Task.State.RUNNING,
+                locked_at=now,
+                locked_by=worker_id,
+                attempts=F("attempts") + 1,
+            )
+            for t in tasks:
+                t.state = Task.State.RUNNING
+                t.locked_at = now
+                t.locked_by = worker_id
+                t.attempts += 1
+    return tasks
+
+
+def owned(t):
+    """
+    `t` as long as this worker's claim on it stands; a worker that lost its
+    lock must not overwrite the new owner's state.
+    """
+    return Task.objects.filter(pk=t.pk, state=Task.State.RUNNING, locked_by=t.locked_by)
+
+
+@contextmanager
+def heartbeat(t):
+    """
+    Refresh the lock of a running task every TASKS_LOCK_TIMEOUT / 3 seconds
+    from a background thread, so long tasks are not claimed again.
+    """
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(get_lock_timeout() / 3):
+                owned(t).update(locked_at=timezone.now())
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, name=f"task-heartbeat-{t.pk}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def ack(t, result=None):
+    if not owned(t).update(
+        state=Task.State.DONE, locked_at=None, result=result, updated_at=timezone.now()
+    ):
+        logger.warning("Task %s #%s finished after losing its lock, result dropped.", t.name, t.pk)
+
+
+def current_task():
+    """
+    The Task being run by run() on this thread, e.g. for get_retry_delay().
+    """
+    return _current_task.get()
+
+
+def get_retry_delay(t):
+    """
+    Seconds until a failing `t` runs again, or None if it is out of attempts.
+    """
+    if t.attempts >= t.max_attempts:
+        return None
+    base = getattr(settings, "TASKS_RETRY_BACKOFF", 30)
+    return min(base * 2 ** (t.attempts - 1), getattr(settings, "TASKS_RETRY_BACKOFF_MAX", 3600))
+
+
+def retry(t, error):
+    """
+    Requeue with exponential backoff, or mark failed after max_attempts.
+    """
+    now = timezone.now()
+    delay = get_retry_delay(t)
+    if delay is None:
+        state, run_at = Task.State.FAILED, t.run_at
+    else:
+        state, run_at = Task.State.QUEUED, now + timedelta(seconds=delay)
+    if not owned(t).update(state=state, run_at=run_at, locked_at=None, last_error=error, updated_at=now):
+        logger.warning("Task %s #%s failed after losing its lock, error dropped.", t.name, t.pk)
+    return state
+
+
+def run(t):
+    """
+    Execute a claimed task and ack or retry it. Returns True on success.
+    """
+    token = _current_task.set(t)
+    try:
+        with heartbeat(t):
+            result = get_task(t.name)(*t.args, **t.kwargs)
+    except Exception:
+        state = retry(t, traceback.format_exc())
+        logger.warning("Task %s #%s failed (attempt %s), now %s.", t.name, t.pk, t.attempts, state)
+        return False
+    finally:
+        _current_task.reset(token)
+    ack(t, result)
+    return True
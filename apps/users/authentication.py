@@ -0,0 +1,81 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+
+class UserCache:
+    """
+    Bounded, thread-safe LRU of jti -> (user, expires_at).
+
+    Entries are per process: invalidate() only reaches the current process,
+    other workers drop their copy when the TTL runs out.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, jti):
+        with self._lock:
+            entry = self._entries.get(jti)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[jti]
+                return None
+            self._entries.move_to_end(jti)
+        # callers may change their request.user, never hand out the cached one
+        return copy.copy(user)
+
+    def set(self, jti, user):
+        with self._lock:
+            self._entries[jti] = (copy.copy(user), time.monotonic() + self.ttl)
+            self._entries.move_to_end(jti)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            stale = [jti for jti, (user, _) in self._entries.items() if user.pk == user_id]
+            for jti in stale:
+                del self._entries[jti]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(
+    max_size=getattr(settings, "JWT_USER_CACHE_SIZE", 10000),
+    ttl=getattr(settings, "JWT_USER_CACHE_TTL", 60),
+)
+
+
+def invalidate_user(user_id):
+    user_cache.invalidate(user_id)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that remembers the user of each access token (by its
+    jti) for JWT_USER_CACHE_TTL seconds, so repeated requests with the same
+    token run no auth query. The token itself is still verified every time.
+    """
+
+    def get_user(self, validated_token):
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        if jti is None:
+            return super().get_user(validated_token)
+        user = user_cache.get(jti)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(jti, user)
+        return user
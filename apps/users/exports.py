@@ -0,0 +1,21 @@
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+USER_EXPORT_FIELDS = [
+    "id",
+    "email",
+    "first_name",
+    "last_name",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+    "date_joined",
+    "last_login",
+    "created_at",
+    "updated_at",
+]
+
+
+def get_export_queryset():
+    return User.objects.order_by("id")
@@ -0,0 +1,161 @@
+import csv
+import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+
+from helper import response_cache
+
+User = get_user_model()
+
+FORMATS = ("csv", "jsonl")
+USER_IMPORT_FIELDS = ["email", "first_name", "last_name", "password"]
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    existing: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    # (row number, message) of the first MAX_REPORTED_ERRORS invalid rows
+    errors: list = field(default_factory=list)
+
+    def add_error(self, row, message):
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((row, message))
+
+    def as_dict(self):
+        return asdict(self)
+
+
+def get_format(name, default="jsonl"):
+    """
+    "csv" or "jsonl" from a file name (.ndjson counts as jsonl).
+    """
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return default
+
+
+def iter_records(f, fmt):
+    """
+    Yield dicts from a text stream of CSV (with a header row) or JSON lines.
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(f)
+        return
+    for number, line in enumerate(f, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"line {number}: {e}")
+
+
+def clean_record(record):
+    """
+    Normalized field dict for one record, or raise ValidationError.
+    """
+    if not isinstance(record, dict):
+        raise ValidationError("Expected an object.")
+    data = {}
+    for name in USER_IMPORT_FIELDS:
+        value = record.get(name)
+        if value is None:
+            value = ""
+        if not isinstance(value, str):
+            raise ValidationError(f"{name}: expected a string.")
+        data[name] = value.strip()
+    data["email"] = User.objects.normalize_email(data["email"])
+    validate_email(data["email"])
+    if data["password"]:
+        validate_password(data["password"], User(email=data["email"]))
+    return data
+
+
+def import_batch(records, first_row, pool, result, seen):
+    """
+    Validate one batch, drop emails already in the file or in the database
+    (one IN query), hash the passwords on `pool` and bulk_create the rest.
+    """
+    rows = []
+    for row, record in enumerate(records, start=first_row):
+        try:
+            data = clean_record(record)
+        except ValidationError as e:
+            result.add_error(row, " ".join(e.messages))
+            continue
+        if data["email"] in seen:
+            result.duplicates += 1
+            continue
+        seen.add(data["email"])
+        rows.append(data)
+
+    existing = set(
+        User.objects.filter(email__in=[data["email"] for data in rows]).values_list("email", flat=True)
+    )
+    result.existing += len(existing)
+    rows = [data for data in rows if data["email"] not in existing]
+
+    with_password = [data for data in rows if data["password"]]
+    hashes = pool.map(make_password, [data["password"] for data in with_password], chunksize=16)
+    for data, encoded in zip(with_password, hashes):
+        data["password"] = encoded
+
+    users = [
+        User(
+            email=data["email"],
+            first_name=data["first_name"],
+            last_name=data["last_name"],
+            # no password given: unusable until the user resets it
+            password=data["password"] or make_password(None),
+        )
+        for data in rows
+    ]
+    # ignore_conflicts: someone may register the same email meanwhile
+    User.objects.bulk_create(users, batch_size=len(users) or 1, ignore_conflicts=True)
+    created = 0
+    if users:
+        # no pks come back for ignored rows; our salted hashes tell them apart
+        created = User.objects.filter(
+            email__in=[user.email for user in users], password__in=[user.password for user in users]
+        ).count()
+    result.created += created
+    result.existing += len(users) - created
+    if created:
+        # bulk_create sends no post_save
+        response_cache.invalidate("users")
+
+
+def import_users(records, batch_size=DEFAULT_BATCH_SIZE, workers=None, progress=None):
+    """
+    Create users from an iterable of records `batch_size` at a time.
+    Password hashing, the slow part, runs on a pool of `workers` processes
+    (default: one per CPU). Returns an ImportResult.
+    """
+    records = iter(records)
+    result = ImportResult()
+    seen = set()
+    row = 1
+    # spawned (non-fork) workers need Django set up to read PASSWORD_HASHERS
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+        while batch := list(islice(records, batch_size)):
+            import_batch(batch, row, pool, result, seen)
+            row += len(batch)
+            if progress:
+                progress(row - 1, result)
+    return result
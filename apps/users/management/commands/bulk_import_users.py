@@ -0,0 +1,50 @@
+import gzip
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users import importer
+
+
+class Command(BaseCommand):
+    help = 'Create users in bulk from CSV or JSONL files (email, first_name, last_name, password)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='Input files (.csv, .jsonl, optionally .gz), or - for stdin')
+        parser.add_argument('--input-format', choices=importer.FORMATS, default=None,
+                            help='Input format (default: from the file extension, jsonl for stdin)')
+        parser.add_argument('--batch-size', type=int, default=importer.DEFAULT_BATCH_SIZE,
+                            help='Users checked and inserted per batch')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Password hashing processes (default: one per CPU)')
+
+    def handle(self, *args, **options):
+        for path in options['paths']:
+            fmt = options['input_format'] or importer.get_format(path.removesuffix('.gz'))
+            try:
+                if path == '-':
+                    result = self.import_file(sys.stdin, fmt, options)
+                else:
+                    opener = gzip.open if path.endswith('.gz') else open
+                    with opener(path, 'rt', encoding='utf-8', newline='') as f:
+                        result = self.import_file(f, fmt, options)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Could not import {path}: {e}')
+
+            for row, message in result.errors:
+                self.stderr.write(f'row {row}: {message}')
+            self.stdout.write(self.style.SUCCESS(
+                f'{path}: created {result.created}, already existed {result.existing}, '
+                f'duplicates {result.duplicates}, invalid {result.invalid}'
+            ))
+
+    def import_file(self, f, fmt, options):
+        def progress(rows, result):
+            self.stderr.write(f'{rows} rows read, {result.created} users created')
+
+        return importer.import_users(
+            importer.iter_records(f, fmt),
+            batch_size=options['batch_size'],
+            workers=options['workers'],
+            progress=progress,
+        )
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.exports import USER_EXPORT_FIELDS, get_export_queryset
+from helper import export
+
+
+class Command(BaseCommand):
+    help = 'Stream all users as NDJSON or CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output-format', choices=list(export.FORMATS), default='ndjson',
+                            help='Output format (default: ndjson)')
+        parser.add_argument('--output', type=str, default=None,
+                            help='File to write to (default: stdout)')
+        parser.add_argument('--chunk-size', type=int, default=export.DEFAULT_CHUNK_SIZE,
+                            help='Rows fetched from the database per round-trip')
+
+    def handle(self, *args, **options):
+        lines = export.iter_export(
+            get_export_queryset(), USER_EXPORT_FIELDS, options['output_format'],
+            chunk_size=options['chunk_size'],
+        )
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        try:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as f:
+                f.writelines(lines)
+        except OSError as e:
+            raise CommandError(f'Could not write {options["output"]}: {e}')
+        self.stderr.write(self.style.SUCCESS(f'Users exported to {options["output"]}'))
@@ -0,0 +1,11 @@
+from rest_framework.pagination import CursorPagination
+
+
+class UserCursorPagination(CursorPagination):
+    """
+    Keyset pagination on the primary key: no OFFSET scan and no COUNT(*).
+    """
+
+    ordering = "-id"
+    page_size_query_param = "page_size"
+    max_page_size = 100
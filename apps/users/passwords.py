@@ -0,0 +1,70 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password, verify_password
+from django.db import connection
+from rest_framework.exceptions import Throttled
+
+# Password hashes are slow on purpose. They run on a small pool, so a login
+# burst occupies at most PASSWORD_HASH_WORKERS threads per process. PBKDF2
+# releases the GIL, so the process's other threads keep serving requests.
+
+_pool = None
+_pending = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool, _pending
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pending = threading.BoundedSemaphore(getattr(settings, "PASSWORD_HASH_MAX_PENDING", 32))
+                _pool = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "PASSWORD_HASH_WORKERS", 2),
+                    thread_name_prefix="password-hash",
+                )
+    return _pool, _pending
+
+
+def run(func, *args):
+    """
+    Run `func` on the hashing pool and wait for it. Raises Throttled (429)
+    instead of queueing once PASSWORD_HASH_MAX_PENDING hashes are waiting.
+    """
+    pool, pending = get_pool()
+    if not pending.acquire(blocking=False):
+        raise Throttled(wait=1, detail="Too many logins in progress, try again shortly.")
+    try:
+        return pool.submit(func, *args).result()
+    finally:
+        pending.release()
+
+
+def check_password(user, raw_password):
+    """
+    User.check_password() on the pool. An outdated hash is upgraded in the
+    background instead of on the request.
+    """
+    encoded = user.password
+    is_correct, must_update = run(verify_password, raw_password, encoded)
+    if is_correct and must_update:
+        get_pool()[0].submit(upgrade_password, user.pk, encoded, raw_password)
+    return is_correct
+
+
+def fake_check_password(raw_password):
+    # same cost as a real check, so unknown emails can't be told apart by timing
+    run(make_password, raw_password)
+
+
+def upgrade_password(user_id, old_encoded, raw_password):
+    try:
+        # skip it if the password changed in the meantime
+        get_user_model().objects.filter(pk=user_id, password=old_encoded).update(
+            password=make_password(raw_password)
+        )
+    finally:
+        connection.close()
@@ -1,10 +1,13 @@
-from rest_framework import serializers
+from rest_framework import exceptions, serializers
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
 from django.contrib.auth.password_validation import validate_password
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.validators import UniqueValidator
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from . import passwords
 
 User = get_user_model()
 
@@ -77,26 +80,26 @@ class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
         self.fields.pop("username", None)  # remove username completely
 
     def validate(self, attrs):
-        email = attrs.get("email")
-        password = attrs.get("password")
-
-        if not email or not password:
-            raise serializers.ValidationError("Email and password are required")
-
-        try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
-            raise InvalidToken("No active account found with the given credentials")
-
-        if not user.is_active:
-            raise InvalidToken("User account is disabled")
-
-        if not user.check_password(password):
-            raise InvalidToken("No active account found with the given credentials")
-
-        refresh = self.get_token(user)
-
-        return {
-            "refresh": str(refresh),
-            "access": str(refresh.access_token),
-        }
+        """
+        One indexed lookup by email and one password hash on the bounded
+        hashing pool. An unknown email pays for a dummy hash as well.
+        """
+        email = User.objects.normalize_email(attrs["email"])
+        password = attrs["password"]
+
+        user = User.objects.filter(email=email).only("id", "password", "is_active", "last_login").first()
+        if user is None:
+            passwords.fake_check_password(password)
+        elif passwords.check_password(user, password) and api_settings.USER_AUTHENTICATION_RULE(user):
+            self.user = user
+            refresh = self.get_token(user)
+            if api_settings.UPDATE_LAST_LOGIN:
+                update_last_login(None, user)
+            return {
+                "refresh": str(refresh),
+                "access": str(refresh.access_token),
+            }
+
+        raise exceptions.AuthenticationFailed(
+            self.error_messages["no_active_account"], "no_active_account"
+        )
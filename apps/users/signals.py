@@ -0,0 +1,19 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from helper import response_cache
+
+from .authentication import invalidate_user
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # deactivation, password or permission changes must not wait for the TTL;
+    # queryset.update() skips this, call invalidate_user() after bulk updates
+    invalidate_user(instance.pk)
+    # the users endpoints, and the user's posts (they embed the email)
+    response_cache.invalidate("users", f"posts:{instance.pk}")
@@ -0,0 +1,18 @@
+import os
+
+from apps.tasks.queue import task
+
+from . import importer
+
+
+@task("users.bulk_import")
+def bulk_import(path, fmt):
+    """
+    Import an uploaded file saved by UserImportView, then delete it (it may
+    hold plain-text passwords).
+    """
+    try:
+        with open(path, encoding="utf-8", newline="") as f:
+            return importer.import_users(importer.iter_records(f, fmt)).as_dict()
+    finally:
+        os.remove(path)
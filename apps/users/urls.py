@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import RegisterView, LoginView, UserAPIView
+from .views import RegisterView, LoginView, UserAPIView, UserExportView, UserImportView
 from rest_framework_simplejwt.views import TokenRefreshView
 
 urlpatterns = [
@@ -7,6 +7,9 @@ urlpatterns = [
     path("login/", LoginView.as_view(), name="login"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("users/", UserAPIView.as_view(), name="users_list"),
+    path("users/export/", UserExportView.as_view(), name="users_export"),
+    path("users/import/", UserImportView.as_view(), name="users_import"),
+    path("users/import/<int:task_id>/", UserImportView.as_view(), name="users_import_status"),
     path("users/me/", UserAPIView.as_view(), name="users_me"),
     path("users/<int:pk>/", UserAPIView.as_view(), name="users_filter"),
 ]
@@ -1,16 +1,37 @@
-from django.http import Http404
-from rest_framework import generics, permissions
+import hashlib
+import os
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Max
+from django.http import HttpResponseNotModified, JsonResponse
+from django.utils.http import parse_etags, quote_etag
+from django.views import View
+from rest_framework import generics, permissions, status
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from django.contrib.auth import get_user_model
 from rest_framework.decorators import action
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.request import Request
 
+from apps.tasks import queue
+from apps.tasks.models import Task
+from apps.users import importer
+from apps.users.exports import USER_EXPORT_FIELDS, get_export_queryset
+from apps.users.pagination import UserCursorPagination
 from apps.users.permissions import IsAdminOrReadOnly
+from helper import export, response_cache
+from helper.asyncapi import check_object_permissions, error_response, login_required
+from helper.db_router import replica_reads
+from helper.response_cache import cache_response
 
-from .serializers import RegisterSerializer, UserSerializer
+from .serializers import EmailTokenObtainPairSerializer, RegisterSerializer, UserSerializer
 
 User = get_user_model()
 
@@ -34,31 +55,123 @@ class LoginView(TokenObtainPairView):
     """
 
     permission_classes = [permissions.AllowAny]
+    serializer_class = EmailTokenObtainPairSerializer
 
 
-class UserAPIView(APIView):
+class UserAPIView(View):
     """
-    API endpoint to:
-    - GET /users/       → List all users
+    API endpoint to (async, read-only):
+    - GET /users/       → List users (cursor paginated, supports If-None-Match)
     - GET /users/<id>/  → Retrieve a specific user
     """
 
     permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
+    pagination_class = UserCursorPagination
 
-    def get_object(self, pk):
-        try:
-            user = User.objects.get(pk=pk)
-            self.check_object_permissions(self.request, user)
-            return user
-        except User.DoesNotExist:
-            raise Http404("User not found")
+    def get_queryset(self):
+        # never load password hashes and other unused columns
+        return User.objects.only(*UserSerializer.Meta.fields)
+
+    async def get_list_etag(self, request):
+        """
+        Changes whenever a user is added, updated or deleted; the full path is
+        mixed in so every page and page size gets its own tag. Deletes only
+        show in the "users" cache version (bumped by apps.users.signals), the
+        indexed Max(updated_at) also catches queryset.update() calls.
+        """
+        state = await User.objects.aaggregate(last_updated=Max("updated_at"))
+        [version] = await sync_to_async(response_cache.get_versions)(["users"])
+        raw = f"{state['last_updated']}:{version}:{request.get_full_path()}"
+        return quote_etag(hashlib.md5(raw.encode()).hexdigest())
 
-    def get(self, request, pk=None, *args, **kwargs):
+    def get_page(self, request):
+        # DRF pagination has no async API; runs in a thread via sync_to_async
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(self.get_queryset(), Request(request), view=self)
+        return paginator.get_paginated_response(UserSerializer(page, many=True).data).data
+
+    @login_required
+    @cache_response("users")  # invalidated by apps.users.signals
+    @replica_reads
+    async def get(self, request, pk=None, *args, **kwargs):
         if pk:  # Single user
-            user = self.get_object(pk)
-            serializer = UserSerializer(user)
-            return Response(serializer.data)
-        else:  # List all users
-            users = User.objects.all()
-            serializer = UserSerializer(users, many=True)
-            return Response(serializer.data)
+            try:
+                user = await self.get_queryset().aget(pk=pk)
+            except User.DoesNotExist:
+                return error_response("User not found", status=status.HTTP_404_NOT_FOUND)
+            try:
+                check_object_permissions(self, request, user)
+            except PermissionDenied as e:
+                return error_response(e.detail, status=e.status_code)
+            return JsonResponse(UserSerializer(user).data)
+        else:  # List users, one page at a time
+            etag = await self.get_list_etag(request)
+            if etag in parse_etags(request.headers.get("If-None-Match", "")):
+                response = HttpResponseNotModified()
+                response["ETag"] = etag
+                return response
+            response = JsonResponse(await sync_to_async(self.get_page)(request))
+            response["ETag"] = etag
+            return response
+
+
+class UserExportView(APIView):
+    """
+    API endpoint for admins to download every user:
+    - GET /users/export/?output=ndjson|csv  → Streamed, constant memory
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        fmt = request.query_params.get("output", "ndjson")
+        if fmt not in export.FORMATS:
+            raise ValidationError({"output": f"Expected one of: {', '.join(export.FORMATS)}."})
+        return export.streaming_export_response(
+            get_export_queryset(), USER_EXPORT_FIELDS, fmt, "users", request=request
+        )
+
+
+class UserImportView(APIView):
+    """
+    API endpoint for admins to create users in bulk:
+    - POST /users/import/            → Upload `file` (CSV or JSONL), 202 with the task id
+    - GET  /users/import/<task_id>/  → Import state and counts
+
+    The file is imported by the task worker (`manage.py run_tasks`), which
+    hashes passwords on a process pool.
+    """
+
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": ["No file was submitted."]})
+        fmt = request.data.get("input_format") or importer.get_format(upload.name, default=None)
+        if fmt not in importer.FORMATS:
+            raise ValidationError({"input_format": [f"Expected one of: {', '.join(importer.FORMATS)}."]})
+
+        import_dir = getattr(settings, "USER_IMPORT_DIR", "user_imports")
+        os.makedirs(import_dir, exist_ok=True)
+        path = os.path.join(import_dir, f"{uuid.uuid4().hex}.{fmt}")
+        # private from the start: it may hold plain-text passwords
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            for chunk in upload.chunks():
+                f.write(chunk)
+
+        # one attempt: the task deletes the file whatever happens
+        t = queue.enqueue("users.bulk_import", path, fmt, max_attempts=1)
+        return Response({"task": t.pk, "state": t.state}, status=status.HTTP_202_ACCEPTED)
+
+    def get(self, request, task_id=None, *args, **kwargs):
+        try:
+            t = Task.objects.get(pk=task_id, name="users.bulk_import")
+        except Task.DoesNotExist:
+            raise NotFound("Import not found.")
+        data = {"task": t.pk, "state": t.state, "result": t.result}
+        if t.state == Task.State.FAILED:
+            data["error"] = t.last_error.strip().splitlines()[-1] if t.last_error else ""
+        return Response(data)
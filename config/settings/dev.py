@@ -21,9 +21,12 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "rest_framework",
     "rest_framework_simplejwt",
+    "django_filters",
     "corsheaders",
     "apps.users",
     "apps.posts",
+    "apps.jobs",
+    "apps.tasks",
     "django_extensions",
 
     # third party apps
@@ -38,6 +41,7 @@ AUTH_USER_MODEL = "users.User"
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 MIDDLEWARE = [
+    "helper.metrics.MetricsMiddleware",  # first, so it times the whole stack
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",  # Must be BEFORE Authentication
     "django.middleware.common.CommonMiddleware",
@@ -84,6 +88,34 @@ DATABASES = {
     }
 }
 
+# Reuse connections instead of opening one per request: either Django's
+# psycopg 3 pool (DB_POOL=true, one pool per process) or persistent
+# connections that are health-checked before reuse. Persistent connections
+# don't suit ASGI (a connection per request thread), use the pool there.
+if os.getenv("DB_POOL", "false").lower() == "true":
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        },
+    }
+elif os.getenv("SERVER_MODE") != "asgi":
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+# Optional read replica for the views wrapped in helper.db_router.replica_reads
+if os.getenv("DB_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.getenv("DB_REPLICA_HOST"),
+        "PORT": os.getenv("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["helper.db_router.ReplicaRouter"]
+# seconds after a change during which cached views read from the primary
+REPLICA_READ_AFTER_WRITE = int(os.getenv("REPLICA_READ_AFTER_WRITE", "5"))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -104,7 +136,7 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.users.authentication.CachedJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.IsAuthenticated"],
@@ -125,6 +157,17 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": True,
 }
 
+# Login: password hashes run on a small pool per process (apps.users.passwords)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+
+# Uploaded user imports wait here for the task worker (shared with it)
+USER_IMPORT_DIR = os.getenv("USER_IMPORT_DIR", os.path.join(BASE_DIR, "user_imports"))
+
+# CachedJWTAuthentication: per-process LRU of token jti -> user
+JWT_USER_CACHE_SIZE = int(os.getenv("JWT_USER_CACHE_SIZE", "10000"))
+JWT_USER_CACHE_TTL = int(os.getenv("JWT_USER_CACHE_TTL", "60"))  # seconds
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -149,6 +192,71 @@ STATIC_ROOT = os.path.join(BASE_DIR, "static")
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 
+# Prometheus metrics on /metrics (helper.metrics)
+# a token replaces the IP check; needed behind a proxy or in docker, where
+# every request comes from the proxy's or the bridge's address
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_ALLOWED_IPS = os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",")
+# e.g. HTTP_X_FORWARDED_FOR, only if the proxy sets it on every request
+METRICS_CLIENT_IP_HEADER = os.getenv("METRICS_CLIENT_IP_HEADER", "")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # helper.response_cache. The web workers, dispatcher and task worker must
+    # share it to see each other's invalidations: Redis when REDIS_URL is set
+    # (docker-compose), otherwise files in the project directory, shared by
+    # the processes of one host (and the containers mounting it).
+    "responses": {
+        "BACKEND": os.getenv(
+            "RESPONSE_CACHE_BACKEND",
+            "django.core.cache.backends.redis.RedisCache" if os.getenv("REDIS_URL")
+            else "django.core.cache.backends.filebased.FileBasedCache",
+        ),
+        "LOCATION": os.getenv(
+            "RESPONSE_CACHE_LOCATION", os.getenv("REDIS_URL") or os.path.join(BASE_DIR, "response_cache")
+        ),
+        # entries are per user and URL; ignored by Redis (set maxmemory there)
+        "OPTIONS": {"MAX_ENTRIES": int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "20000"))},
+    },
+}
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", "300"))  # seconds
+
+# Background tasks (apps.tasks), run with `manage.py run_tasks`
+TASKS_MAX_ATTEMPTS = 5
+TASKS_LOCK_TIMEOUT = 600  # seconds without a heartbeat before a running task counts as abandoned
+TASKS_RETRY_BACKOFF = 30  # seconds, doubled on every attempt
+TASKS_RETRY_BACKOFF_MAX = 3600
+
+# Posts API
+POSTS_BULK_MAX_ITEMS = int(os.getenv("POSTS_BULK_MAX_ITEMS", "1000"))
+POSTS_BULK_BATCH_SIZE = 500
+# failed shares of a post after which its delivery is rejected (posts.PostDelivery)
+POST_DELIVERY_MAX_ATTEMPTS = int(os.getenv("POST_DELIVERY_MAX_ATTEMPTS", "5"))
+
+# LinkedIn API client
+LINKEDIN_HTTP_POOL_SIZE = int(os.getenv("LINKEDIN_HTTP_POOL_SIZE", "10"))
+LINKEDIN_HTTP_CONNECT_TIMEOUT = float(os.getenv("LINKEDIN_HTTP_CONNECT_TIMEOUT", "5"))
+LINKEDIN_HTTP_READ_TIMEOUT = float(os.getenv("LINKEDIN_HTTP_READ_TIMEOUT", "30"))
+LINKEDIN_HTTP_MAX_RETRIES = int(os.getenv("LINKEDIN_HTTP_MAX_RETRIES", "3"))
+LINKEDIN_HTTP_BACKOFF_FACTOR = float(os.getenv("LINKEDIN_HTTP_BACKOFF_FACTOR", "0.5"))
+LINKEDIN_HTTP_MAX_RETRY_AFTER = float(os.getenv("LINKEDIN_HTTP_MAX_RETRY_AFTER", "30"))
+# connections per ASGI worker for the async client (async views)
+LINKEDIN_HTTP_ASYNC_POOL_SIZE = int(os.getenv("LINKEDIN_HTTP_ASYNC_POOL_SIZE", "100"))
+# keep one async client per worker; under WSGI each async view gets a new
+# event loop, so the client is opened and closed per request instead
+LINKEDIN_HTTP_SHARED_ASYNC_CLIENT = os.getenv("SERVER_MODE") == "asgi"
+# Shared by all workers through the posts.RateLimitBucket table
+LINKEDIN_RATE_LIMITS = {
+    "member": {"rate": os.getenv("LINKEDIN_MEMBER_RATE", "150/day"), "burst": 10},
+    "app": {"rate": os.getenv("LINKEDIN_APP_RATE", "100000/day"), "burst": 100},
+}
+LINKEDIN_RATE_LIMIT_MAX_WAIT = float(os.getenv("LINKEDIN_RATE_LIMIT_MAX_WAIT", "10"))
+LINKEDIN_BULK_MAX_WORKERS = int(os.getenv("LINKEDIN_BULK_MAX_WORKERS", "10"))
+LINKEDIN_PER_TOKEN_CONCURRENCY = int(os.getenv("LINKEDIN_PER_TOKEN_CONCURRENCY", "2"))
+
+
 # Django Allauth Configuration
 ACCOUNT_LOGIN_METHODS = {"email"}
 ACCOUNT_FORMS = {
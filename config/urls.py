@@ -20,10 +20,14 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from helper.metrics import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/", include("apps.users.urls")),
+    path("api/v1/", include("apps.posts.urls")),
     path("accounts/", include("allauth.urls")),
+    path("metrics", metrics_view, name="metrics"),
 ]
 
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
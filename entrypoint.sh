@@ -15,11 +15,27 @@ python manage.py migrate --noinput
 # Collect static files (even if you're not using them, Django expects this)
 python manage.py collectstatic --noinput
 
+WORKERS=${WEB_CONCURRENCY:-4}
+
+if [ "$SERVER_MODE" = "asgi" ]; then
+  echo "Starting Gunicorn with Uvicorn workers (ASGI)..."
+
+  # Async views keep many slow LinkedIn calls in flight per worker
+  exec gunicorn config.asgi:application \
+      --worker-class uvicorn_worker.UvicornWorker \
+      --workers $WORKERS \
+      --bind 0.0.0.0:8000 \
+      --log-level info \
+      --access-logfile -
+fi
+
 echo "Starting Gunicorn..."
 
-# Start Gunicorn with 4 workers, bound to 0.0.0.0:8000
+# Start Gunicorn with 4 workers, bound to 0.0.0.0:8000. Threaded workers keep
+# serving reads while a thread waits on a password hash (apps.users.passwords)
 exec gunicorn config.wsgi:application \
-    --workers 4 \
+    --workers $WORKERS \
+    --threads ${WEB_THREADS:-4} \
     --bind 0.0.0.0:8000 \
     --log-level info \
     --access-logfile -
@@ -0,0 +1,83 @@
+import functools
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from rest_framework import exceptions
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+
+from apps.users.authentication import CachedJWTAuthentication
+
+# DRF's APIView is synchronous. The I/O-bound endpoints are plain async
+# Django views instead, so under ASGI they wait on the event loop rather than
+# holding a worker thread; these helpers give them the API's auth and errors.
+
+
+def error_response(detail, status):
+    if not isinstance(detail, dict):
+        detail = {"detail": detail}
+    return JsonResponse(detail, status=status)
+
+
+async def authenticate(request):
+    """
+    JWT like the DRF views. Session cookies are only accepted for safe
+    methods, since these views don't go through DRF's CSRF check.
+    """
+    result = await sync_to_async(CachedJWTAuthentication().authenticate)(request)
+    if result is not None:
+        return result[0]
+    if request.method in SAFE_METHODS:
+        user = await request.auser()
+        if user.is_authenticated:
+            return user
+    return None
+
+
+def check_permissions(view, request):
+    """
+    APIView.initial() for an async view: the view's `permission_classes` and
+    `throttle_classes` (DRF's defaults if unset). Raises DRF exceptions.
+    """
+    for permission in getattr(view, "permission_classes", api_settings.DEFAULT_PERMISSION_CLASSES):
+        if not permission().has_permission(request, view):
+            raise exceptions.PermissionDenied(getattr(permission, "message", None))
+    waits = []
+    for throttle in getattr(view, "throttle_classes", api_settings.DEFAULT_THROTTLE_CLASSES):
+        throttle = throttle()
+        if not throttle.allow_request(request, view):
+            waits.append(throttle.wait())
+    if waits:
+        raise exceptions.Throttled(max((wait for wait in waits if wait is not None), default=None))
+
+
+def check_object_permissions(view, request, obj):
+    for permission in getattr(view, "permission_classes", api_settings.DEFAULT_PERMISSION_CLASSES):
+        if not permission().has_object_permission(request, view, obj):
+            raise exceptions.PermissionDenied(getattr(permission, "message", None))
+
+
+def login_required(view):
+    """
+    Decorate an async view method: 401 unless authenticated, then the view's
+    DRF permission and throttle classes (403/429); sets request.user.
+    """
+    @functools.wraps(view)
+    async def wrapper(self, request, *args, **kwargs):
+        try:
+            user = await authenticate(request)
+        except exceptions.AuthenticationFailed as e:
+            return error_response(e.detail, status=401)
+        if user is None:
+            return error_response("Authentication credentials were not provided.", status=401)
+        request.user = user
+        try:
+            # throttles read and write the cache
+            await sync_to_async(check_permissions)(self, request)
+        except exceptions.APIException as e:
+            response = error_response(e.detail, status=e.status_code)
+            if getattr(e, "wait", None):
+                response["Retry-After"] = str(int(e.wait))
+            return response
+        return await view(self, request, *args, **kwargs)
+    return wrapper
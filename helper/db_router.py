@@ -0,0 +1,77 @@
+import contextvars
+import functools
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+
+REPLICA_ALIAS = "replica"
+
+# Reads only go to the replica inside replica_reads(), so everything else
+# (logins, writes followed by reads) never sees replication lag. A context
+# variable follows sync_to_async into the ORM thread of async views.
+_use_replica = contextvars.ContextVar("use_replica", default=False)
+_force_primary = contextvars.ContextVar("force_primary", default=False)
+
+
+def has_replica():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def primary_reads():
+    """
+    Read from the primary even inside replica_reads(), e.g. right after a
+    write the replica may not have replayed yet.
+    """
+    token = _force_primary.set(True)
+    try:
+        yield
+    finally:
+        _force_primary.reset(token)
+
+
+def replica_reads(view):
+    """
+    Send the ORM reads of a (sync or async) view to the replica, when one is
+    configured in DATABASES.
+    """
+    if iscoroutinefunction(view):
+        @functools.wraps(view)
+        async def async_wrapper(*args, **kwargs):
+            token = _use_replica.set(True)
+            try:
+                return await view(*args, **kwargs)
+            finally:
+                _use_replica.reset(token)
+        return async_wrapper
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        token = _use_replica.set(True)
+        try:
+            return view(*args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        # a DatabaseCache table (the response cache versions and "written"
+        # markers) must not lag behind the invalidations made on the primary
+        if model._meta.app_label == "django_cache":
+            return None
+        if _use_replica.get() and not _force_primary.get() and has_replica():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # same data on both aliases
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
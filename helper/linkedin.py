@@ -1,9 +1,70 @@
-import requests
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 
+import httpx
+import requests
+import urllib3
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import connection
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from helper import metrics, ratelimit
+from helper.ratelimit import RateLimited
+
+LINKEDIN_API_HOST = "https://api.linkedin.com"
+
+_session = None
+_session_lock = threading.Lock()
+# an httpx.AsyncClient is bound to the event loop it was first used on
+_async_clients = weakref.WeakKeyDictionary()
+
+
+class PermanentShareError(Exception):
+    """
+    Sending the same share again can't succeed (bad content, no usable
+    LinkedIn connection), so it is not retried.
+    """
+    pass
+
+
+class UserNotConnectedLinkedIn(PermanentShareError):
+    pass
+
+
+class InvalidLinkedInConnection(PermanentShareError):
+    pass
+
+
+class ShareFailed(Exception):
+    """
+    LinkedIn answered with an error status; `status_code` is kept for the
+    delivery's last_error.
+    """
+
+    def __init__(self, status_code, detail=""):
+        message = f"LinkedIn responded {status_code}"
+        if detail:
+            message = f"{message}: {detail}"
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ShareRejected(ShareFailed, PermanentShareError):
+    pass
 
 
-class UserNotConnectedLinkedIn(Exception):
+class ShareOutcomeUnknown(Exception):
+    """
+    The share request reached LinkedIn (or may have) but we never learned the
+    result, so it may or may not be published. Not safe to retry blindly.
+    """
     pass
 
 
@@ -14,28 +75,165 @@ def get_linkedin_user_details(user):
         raise UserNotConnectedLinkedIn("LinkedIn is not connected on this user.")
     return linkedin_social
 
-def get_share_headers(linkedin_social):
-    tokens = linkedin_social.socialtoken_set.all()
-    if not tokens.exists():
-        raise Exception("LinkedIn connection is invalid. Please login again.")
-    social_token = tokens.first()
-    return {
-        "Authorization": f"Bearer {social_token.token}",
-        "X-Restli-Protocol-Version": "2.0.0"
-    }
 
+class _Retry(Retry):
+    # Never park a worker for longer than LINKEDIN_HTTP_MAX_RETRY_AFTER seconds,
+    # whatever the server asks for.
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, getattr(settings, "LINKEDIN_HTTP_MAX_RETRY_AFTER", 30))
 
-def post_to_linkedin(user, text:str):
+
+def get_timeout():
+    return (
+        getattr(settings, "LINKEDIN_HTTP_CONNECT_TIMEOUT", 5),
+        getattr(settings, "LINKEDIN_HTTP_READ_TIMEOUT", 30),
+    )
+
+
+def build_session():
+    retries = getattr(settings, "LINKEDIN_HTTP_MAX_RETRIES", 3)
+    retry = _Retry(
+        total=retries,
+        connect=retries,
+        # a read timeout on a POST may mean LinkedIn already published it
+        read=0,
+        status=retries,
+        backoff_factor=getattr(settings, "LINKEDIN_HTTP_BACKOFF_FACTOR", 0.5),
+        # only statuses that guarantee nothing was published: a 500/502/504 on
+        # a POST may come after LinkedIn created the post
+        status_forcelist=getattr(settings, "LINKEDIN_HTTP_RETRY_STATUSES", (429, 503)),
+        allowed_methods=None,  # retry POST as well
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    pool_size = getattr(settings, "LINKEDIN_HTTP_POOL_SIZE", 10)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount(LINKEDIN_API_HOST, adapter)
+    return session
+
+
+def get_session():
+    """
+    Process-wide keep-alive session, so shares reuse pooled TLS connections.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def build_async_client():
+    """
+    Transport retries only cover failed connects; 429/503 are retried in
+    ashare_on_linkedin().
+    """
+    connect_timeout, read_timeout = get_timeout()
+    pool_size = getattr(settings, "LINKEDIN_HTTP_ASYNC_POOL_SIZE", 100)
+    transport = httpx.AsyncHTTPTransport(
+        retries=getattr(settings, "LINKEDIN_HTTP_MAX_RETRIES", 3),
+        limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+    )
+    return httpx.AsyncClient(
+        base_url=LINKEDIN_API_HOST,
+        transport=transport,
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+    )
+
+
+def get_async_client():
+    """
+    Keep-alive AsyncClient for the running event loop (one per ASGI worker).
+    Never closed, so only for loops that live as long as the process.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = build_async_client()
+    return client
+
+
+@asynccontextmanager
+async def async_client():
+    """
+    The worker's keep-alive client under ASGI. Under WSGI every async view
+    runs on a new event loop, so the client only lives for the call and is
+    closed after it.
+    """
+    if getattr(settings, "LINKEDIN_HTTP_SHARED_ASYNC_CLIENT", False):
+        yield get_async_client()
+        return
+    async with build_async_client() as client:
+        yield client
+
+
+def load_share_credentials(user):
+    """
+    Resolve (LinkedIn member id, access token) for `user` in a single query.
+    """
+    from allauth.socialaccount.models import SocialToken
+
+    social_token = (
+        SocialToken.objects.filter(account__user=user, account__provider="linkedin")
+        .select_related("account")
+        .first()
+    )
+    if social_token is None:
+        # tell "never connected" apart from "connected but token missing"
+        get_linkedin_user_details(user)
+        raise InvalidLinkedInConnection("LinkedIn connection is invalid. Please login again.")
+    linkedin_user_id = social_token.account.uid
+    if not linkedin_user_id:
+        raise InvalidLinkedInConnection("Invalid LinkedIn User Id")
+    return linkedin_user_id, social_token.token
+
+
+def get_share_credentials(user):
+    """
+    Resolve the (LinkedIn member id, request headers) needed to share as `user`.
+
+    Not cached across calls: tokens are refreshed and revoked in the web
+    process while the dispatcher and task workers publish, so a per-process
+    cache would go stale. post_many() resolves once per user and batch.
+    """
     User = get_user_model()
     if not isinstance(user, User):
         raise Exception("Must be a user")
-    linkedin_social = get_linkedin_user_details(user)
-    linkedin_user_id = linkedin_social.uid
-    if not linkedin_user_id:
-        raise Exception("Invalid LinkedIn User Id")
-    headers = get_share_headers(linkedin_social)
-    endpoint = "https://api.linkedin.com/v2/ugcPosts"
-    payload = {
+    linkedin_user_id, token = load_share_credentials(user)
+    return linkedin_user_id, {
+        "Authorization": f"Bearer {token}",
+        "X-Restli-Protocol-Version": "2.0.0"
+    }
+
+
+def get_rate_limits(linkedin_user_id):
+    """
+    (key, tokens per second, burst) buckets a share has to pay into: one per
+    LinkedIn member and one for the whole app.
+    """
+    limits = getattr(settings, "LINKEDIN_RATE_LIMITS", {})
+    member = limits.get("member", {"rate": "150/day", "burst": 10})
+    app = limits.get("app", {"rate": "100000/day", "burst": 100})
+    return [
+        (f"linkedin:member:{linkedin_user_id}", ratelimit.parse_rate(member["rate"]), member["burst"]),
+        ("linkedin:app", ratelimit.parse_rate(app["rate"]), app["burst"]),
+    ]
+
+
+def get_retry_after(response, default=60):
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return default
+
+
+def get_share_payload(linkedin_user_id, text:str):
+    return {
         "author": f"urn:li:person:{linkedin_user_id}",
         "lifecycleState": "PUBLISHED",
         "specificContent": {
@@ -50,9 +248,185 @@ def post_to_linkedin(user, text:str):
             "com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"
         }
     }
-    response = requests.post(endpoint, json=payload, headers=headers)
+
+
+def check_share_response(response):
+    """
+    Raise unless a (requests or httpx) share response is a success.
+    """
+    if response.status_code >= 500 and response.status_code != 503:
+        raise ShareOutcomeUnknown(f"LinkedIn responded {response.status_code}")
+    if response.status_code >= 500:
+        raise ShareFailed(response.status_code)
+    if response.status_code >= 400:
+        # 429 never gets here; any other 4xx fails the same way again
+        raise ShareRejected(response.status_code, response.text[:500])
+    return response
+
+
+def may_have_been_sent(exc):
+    """
+    False for (requests or httpx) transport errors raised before the request
+    went out: DNS, refused connections, TLS handshakes, proxies, a full pool.
+    Those are plain failures, safe to retry; anything later may have reached
+    LinkedIn.
+    """
+    if isinstance(exc, (requests.ConnectTimeout, requests.exceptions.SSLError, requests.exceptions.ProxyError)):
+        return False
+    if isinstance(exc, requests.ConnectionError):
+        reason = exc.args[0] if exc.args else None
+        # urllib3 wraps the last error of its connect retries in MaxRetryError
+        reason = getattr(reason, "reason", reason)
+        return not isinstance(reason, (
+            urllib3.exceptions.ConnectTimeoutError,  # incl. NewConnectionError, NameResolutionError
+            urllib3.exceptions.SSLError,
+            urllib3.exceptions.ProxyError,
+        ))
+    if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout, httpx.ProxyError)):
+        return False
+    return True
+
+
+def share_on_linkedin(linkedin_user_id, headers, text:str):
+    limits = get_rate_limits(linkedin_user_id)
+    ratelimit.acquire(limits, max_wait=getattr(settings, "LINKEDIN_RATE_LIMIT_MAX_WAIT", 10))
+    endpoint = f"{LINKEDIN_API_HOST}/v2/ugcPosts"
+    payload = get_share_payload(linkedin_user_id, text)
     try:
-        response.raise_for_status()
-    except:
-        raise Exception("Invalid post, please try again later")
-    return response
\ No newline at end of file
+        with metrics.track_linkedin("ugcPosts") as call:
+            response = get_session().post(endpoint, json=payload, headers=headers, timeout=get_timeout())
+            call["status"] = response.status_code
+    except (requests.Timeout, requests.ConnectionError) as e:
+        if may_have_been_sent(e):
+            raise ShareOutcomeUnknown(str(e)) from e
+        raise
+    if response.status_code == 429:
+        # still throttled after the session's own retries: stop every worker
+        # from spending this member's budget until LinkedIn lets us back in
+        retry_after = get_retry_after(response)
+        key, rate, _ = limits[0]
+        ratelimit.penalize(key, rate, retry_after)
+        raise RateLimited(retry_after)
+    return check_share_response(response)
+
+
+async def ashare_on_linkedin(linkedin_user_id, headers, text:str):
+    """
+    share_on_linkedin() on the async client, with the same rate limits,
+    retry statuses and error mapping. Nothing blocks the event loop.
+    """
+    limits = get_rate_limits(linkedin_user_id)
+    await ratelimit.aacquire(limits, max_wait=getattr(settings, "LINKEDIN_RATE_LIMIT_MAX_WAIT", 10))
+    payload = get_share_payload(linkedin_user_id, text)
+    retries = getattr(settings, "LINKEDIN_HTTP_MAX_RETRIES", 3)
+    backoff = getattr(settings, "LINKEDIN_HTTP_BACKOFF_FACTOR", 0.5)
+    statuses = getattr(settings, "LINKEDIN_HTTP_RETRY_STATUSES", (429, 503))
+    async with async_client() as client:
+        for attempt in range(retries + 1):
+            try:
+                with metrics.track_linkedin("ugcPosts") as call:
+                    response = await client.post("/v2/ugcPosts", json=payload, headers=headers)
+                    call["status"] = response.status_code
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                if may_have_been_sent(e):
+                    raise ShareOutcomeUnknown(str(e)) from e
+                raise
+            if response.status_code not in statuses or attempt == retries:
+                break
+            delay = get_retry_after(response, default=backoff * 2 ** attempt)
+            await asyncio.sleep(min(delay, getattr(settings, "LINKEDIN_HTTP_MAX_RETRY_AFTER", 30)))
+    if response.status_code == 429:
+        retry_after = get_retry_after(response)
+        key, rate, _ = limits[0]
+        await sync_to_async(ratelimit.penalize)(key, rate, retry_after)
+        raise RateLimited(retry_after)
+    return check_share_response(response)
+
+
+def get_share_urn(response):
+    """
+    URN of the created post ("urn:li:share:..." / "urn:li:ugcPost:...").
+    """
+    urn = response.headers.get("x-restli-id")
+    if urn:
+        return urn
+    try:
+        return response.json().get("id", "")
+    except ValueError:
+        return ""
+
+
+def post_to_linkedin(user, text:str):
+    linkedin_user_id, headers = get_share_credentials(user)
+    return share_on_linkedin(linkedin_user_id, headers, text)
+
+
+async def apost_to_linkedin(user, text:str):
+    linkedin_user_id, headers = await sync_to_async(get_share_credentials)(user)
+    return await ashare_on_linkedin(linkedin_user_id, headers, text)
+
+
+@dataclass
+class ShareResult:
+    user: object
+    text: str
+    response: object = None
+    error: Exception = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def post_many(items, max_workers=None, per_token_limit=None):
+    """
+    Share many (user, text) pairs concurrently on a bounded thread pool.
+
+    Credentials are resolved once per user on the calling thread (worker
+    threads never touch the database) and at most `per_token_limit` requests
+    run at the same time for any one access token. Returns a ShareResult per
+    item, in input order; failures are reported, not raised.
+    """
+    if max_workers is None:
+        max_workers = getattr(settings, "LINKEDIN_BULK_MAX_WORKERS", 10)
+    if per_token_limit is None:
+        per_token_limit = getattr(settings, "LINKEDIN_PER_TOKEN_CONCURRENCY", 2)
+
+    items = list(items)
+    results = [None] * len(items)
+    credentials = {}
+    token_limits = {}
+    jobs = []
+    for index, (user, text) in enumerate(items):
+        if user.pk not in credentials:
+            try:
+                credentials[user.pk] = get_share_credentials(user)
+            except Exception as e:
+                credentials[user.pk] = e
+        resolved = credentials[user.pk]
+        if isinstance(resolved, Exception):
+            results[index] = ShareResult(user, text, error=resolved)
+            continue
+        linkedin_user_id, headers = resolved
+        limit = token_limits.setdefault(
+            headers["Authorization"], threading.BoundedSemaphore(per_token_limit)
+        )
+        jobs.append((index, user, text, linkedin_user_id, headers, limit))
+
+    def run(job):
+        index, user, text, linkedin_user_id, headers, limit = job
+        with limit:
+            try:
+                response = share_on_linkedin(linkedin_user_id, headers, text)
+            except Exception as e:
+                return index, ShareResult(user, text, error=e)
+            finally:
+                # the rate limiter opened a connection on this pool thread
+                connection.close()
+        return index, ShareResult(user, text, response=response)
+
+    if jobs:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+            for index, result in pool.map(run, jobs):
+                results[index] = result
+    return results
@@ -0,0 +1,254 @@
+import contextvars
+import hmac
+import os
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils import timezone
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+# Everything lives in process memory and is exposed on /metrics. Under
+# several Gunicorn workers set PROMETHEUS_MULTIPROC_DIR so every worker
+# writes its samples there and /metrics sums them.
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time spent in the view stack, by route.",
+    ["view", "method"],
+)
+REQUESTS = Counter(
+    "http_requests_total", "Requests by route and response status.",
+    ["view", "method", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requests being handled right now (worker saturation).",
+    multiprocess_mode="livesum",
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries", "Database queries run per request, by route.",
+    ["view"], buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Time spent in database queries per request, by route.",
+    ["view"],
+)
+LINKEDIN_LATENCY = Histogram(
+    "linkedin_request_duration_seconds", "LinkedIn API call latency, by endpoint.",
+    ["endpoint"],
+)
+LINKEDIN_RESPONSES = Counter(
+    "linkedin_responses_total", "LinkedIn API calls by endpoint and status code ('error' if none).",
+    ["endpoint", "status"],
+)
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+# set by the middleware; sync_to_async copies the context, so queries run on
+# the ORM's worker thread for an async view are counted too
+_request_stats = contextvars.ContextVar("request_stats", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - start
+
+
+def install_query_wrapper(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+connection_created.connect(install_query_wrapper, dispatch_uid="helper.metrics.install_query_wrapper")
+
+
+@contextmanager
+def track_linkedin(endpoint):
+    """
+    Time one LinkedIn call; set call["status"] to the response status code.
+
+        with metrics.track_linkedin("ugcPosts") as call:
+            response = session.post(...)
+            call["status"] = response.status_code
+    """
+    call = {"status": "error"}
+    start = time.perf_counter()
+    try:
+        yield call
+    finally:
+        LINKEDIN_LATENCY.labels(endpoint).observe(time.perf_counter() - start)
+        LINKEDIN_RESPONSES.labels(endpoint, str(call["status"])).inc()
+
+
+def get_view_label(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unresolved>"
+    return match.route or match.view_name
+
+
+class MetricsMiddleware:
+    """
+    Records latency, status and DB usage of every request, per URL route.
+    Keep it first in MIDDLEWARE so the whole stack is timed.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token, start = self.start()
+        response = None
+        try:
+            response = self.get_response(request)
+        finally:
+            self.finish(request, response, token, start)
+        return response
+
+    async def __acall__(self, request):
+        token, start = self.start()
+        response = None
+        try:
+            response = await self.get_response(request)
+        finally:
+            self.finish(request, response, token, start)
+        return response
+
+    def start(self):
+        REQUESTS_IN_PROGRESS.inc()
+        return _request_stats.set(RequestStats()), time.perf_counter()
+
+    def finish(self, request, response, token, start):
+        elapsed = time.perf_counter() - start
+        stats = _request_stats.get()
+        _request_stats.reset(token)
+        REQUESTS_IN_PROGRESS.dec()
+
+        view = get_view_label(request)
+        status = response.status_code if response is not None else 500
+        REQUEST_LATENCY.labels(view, request.method).observe(elapsed)
+        REQUESTS.labels(view, request.method, str(status)).inc()
+        REQUEST_DB_QUERIES.labels(view).observe(stats.queries)
+        REQUEST_DB_SECONDS.labels(view).observe(stats.db_seconds)
+
+
+class QueueCollector:
+    """
+    Backlog of the scheduled-post dispatcher and the task queue, read from
+    the database at scrape time.
+    """
+
+    def collect(self):
+        from django.db.models import Count, Min
+
+        from apps.posts import scheduler
+        from apps.tasks.models import Task
+
+        now = timezone.now()
+        try:
+            due = scheduler.due_posts(now).aggregate(total=Count("id"), oldest=Min("share_at"))
+            queues = list(
+                Task.objects.filter(state=Task.State.QUEUED, run_at__lte=now)
+                .values("queue")
+                .annotate(total=Count("id"), oldest=Min("run_at"))
+            )
+        except DatabaseError:
+            # keep the in-process metrics scrapeable while the database is down
+            return []
+
+        posts_due = GaugeMetricFamily("posts_due", "Posts past share_at and not claimed.")
+        posts_due.add_metric([], due["total"])
+        posts_lag = GaugeMetricFamily(
+            "posts_dispatch_lag_seconds", "Age of the oldest due post that is not claimed yet."
+        )
+        posts_lag.add_metric([], (now - due["oldest"]).total_seconds() if due["oldest"] else 0)
+
+        tasks_queued = GaugeMetricFamily("tasks_queued", "Runnable tasks by queue.", labels=["queue"])
+        tasks_lag = GaugeMetricFamily(
+            "tasks_queue_lag_seconds", "Age of the oldest runnable task by queue.", labels=["queue"]
+        )
+        for row in queues:
+            tasks_queued.add_metric([row["queue"]], row["total"])
+            tasks_lag.add_metric([row["queue"]], (now - row["oldest"]).total_seconds())
+
+        return [posts_due, posts_lag, tasks_queued, tasks_lag]
+
+
+_registry = None
+
+
+def get_registry():
+    global _registry
+    if _registry is None:
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            from prometheus_client import multiprocess
+
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        registry.register(QueueCollector())
+        _registry = registry
+    return _registry
+
+
+def get_client_ip(request):
+    """
+    REMOTE_ADDR, or the address a trusted reverse proxy put in
+    METRICS_CLIENT_IP_HEADER (the last X-Forwarded-For entry is the one the
+    proxy appended itself).
+    """
+    header = getattr(settings, "METRICS_CLIENT_IP_HEADER", "")
+    if header and request.META.get(header):
+        return request.META[header].split(",")[-1].strip()
+    return request.META.get("REMOTE_ADDR")
+
+
+def is_allowed(request):
+    """
+    With METRICS_TOKEN set, only "Authorization: Bearer <token>" is allowed;
+    otherwise clients on METRICS_ALLOWED_IPS.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        given = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        return hmac.compare_digest(given.encode(), token.encode())
+    allowed = getattr(settings, "METRICS_ALLOWED_IPS", ["127.0.0.1", "::1"])
+    return "*" in allowed or get_client_ip(request) in allowed
+
+
+def metrics_view(request):
+    """
+    Prometheus text exposition, for scrapers with METRICS_TOKEN or on
+    METRICS_ALLOWED_IPS.
+    """
+    if not is_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST)
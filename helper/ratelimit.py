@@ -0,0 +1,130 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.db import connection, transaction
+from django.utils import timezone
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class RateLimited(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f"Rate limit reached, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+def parse_rate(rate):
+    """
+    "150/day" -> tokens per second, same format as DRF throttle rates.
+    """
+    num, period = rate.split("/")
+    return int(num) / PERIODS[period[0]]
+
+
+def get_bucket_model():
+    return apps.get_model("posts", "RateLimitBucket")
+
+
+def outside_transaction(func, *args):
+    """
+    Run `func` in autocommit mode. Inside the caller's transaction (admin
+    views, dispatcher claims) the bucket row locks, shared by every process,
+    would be held until that transaction ends; a thread has a connection of
+    its own that commits right away.
+    """
+    if not connection.in_atomic_block:
+        return func(*args)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(_run_and_close, func, *args).result()
+
+
+def _run_and_close(func, *args):
+    try:
+        return func(*args)
+    finally:
+        connection.close()
+
+
+def try_acquire(limits):
+    """
+    Take one token from every bucket in `limits` ((key, rate, burst) tuples),
+    or from none of them. Returns 0 on success, otherwise the seconds until
+    all buckets can pay.
+    """
+    return outside_transaction(_try_acquire, limits)
+
+
+def _try_acquire(limits):
+    Bucket = get_bucket_model()
+    # lock rows in a fixed order so concurrent callers can't deadlock
+    limits = sorted(limits)
+    with transaction.atomic():
+        buckets = []
+        for key, rate, burst in limits:
+            bucket, _ = Bucket.objects.select_for_update().get_or_create(
+                key=key, defaults={"tokens": burst, "updated_at": timezone.now()}
+            )
+            buckets.append((bucket, rate, burst))
+
+        now = timezone.now()
+        wait = 0
+        for bucket, rate, burst in buckets:
+            elapsed = max((now - bucket.updated_at).total_seconds(), 0)
+            bucket.tokens = min(burst, bucket.tokens + elapsed * rate)
+            bucket.updated_at = now
+            if bucket.tokens < 1:
+                wait = max(wait, (1 - bucket.tokens) / rate)
+        for bucket, rate, burst in buckets:
+            if not wait:
+                bucket.tokens -= 1
+            bucket.save(update_fields=["tokens", "updated_at"])
+    return wait
+
+
+def acquire(limits, max_wait=0):
+    """
+    Block until a token is available in every bucket, for at most `max_wait`
+    seconds; raises RateLimited if that is not enough. Never waits inside a
+    transaction, which would keep its locks for the whole wait.
+    """
+    if connection.in_atomic_block:
+        max_wait = 0
+    deadline = time.monotonic() + max_wait
+    while True:
+        wait = try_acquire(limits)
+        if not wait:
+            return
+        if time.monotonic() + wait > deadline:
+            raise RateLimited(wait)
+        time.sleep(wait)
+
+
+async def aacquire(limits, max_wait=0):
+    """
+    acquire() for async callers: waits on the event loop, not on a thread.
+    """
+    deadline = time.monotonic() + max_wait
+    while True:
+        wait = await sync_to_async(try_acquire)(limits)
+        if not wait:
+            return
+        if time.monotonic() + wait > deadline:
+            raise RateLimited(wait)
+        await asyncio.sleep(wait)
+
+
+def penalize(key, rate, seconds):
+    """
+    Empty a bucket so it only pays out again after `seconds`, e.g. when the
+    remote API answered 429 with a Retry-After.
+    """
+    outside_transaction(_penalize, key, rate, seconds)
+
+
+def _penalize(key, rate, seconds):
+    get_bucket_model().objects.filter(key=key).update(
+        tokens=-seconds * rate, updated_at=timezone.now()
+    )
@@ -0,0 +1,154 @@
+import contextlib
+import functools
+import hashlib
+import uuid
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework.response import Response
+
+from helper import db_router
+
+# Responses are cached per user and full path under one or more scopes, e.g.
+# "users" or "posts:42". Every scope has a random version token stored in the
+# cache itself; invalidate() replaces the token, so all entries of the scope
+# are orphaned at once and every process sharing the cache sees it. Orphans
+# expire with RESPONSE_CACHE_TIMEOUT.
+
+CACHE_ALIAS = "responses"
+
+
+def get_cache():
+    return caches[CACHE_ALIAS if CACHE_ALIAS in settings.CACHES else "default"]
+
+
+def get_version_key(scope):
+    return f"response:version:{scope}"
+
+
+def get_versions(scopes):
+    cache = get_cache()
+    keys = [get_version_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # add() so concurrent first requests agree on one token
+            cache.add(key, uuid.uuid4().hex, None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def get_written_key(scope):
+    return f"response:written:{scope}"
+
+
+def invalidate(*scopes):
+    """
+    Drop every entry of `scopes` once the current transaction commits (right
+    away outside one). Invalidating earlier would let a concurrent request
+    cache the not yet committed state under the new version.
+    """
+    transaction.on_commit(lambda: _invalidate(scopes))
+
+
+def _invalidate(scopes):
+    cache = get_cache()
+    cache.set_many({get_version_key(scope): uuid.uuid4().hex for scope in scopes}, None)
+    if db_router.has_replica():
+        # don't let a lagging replica refill the cache with the old rows
+        cache.set_many(
+            {get_written_key(scope): 1 for scope in scopes},
+            getattr(settings, "REPLICA_READ_AFTER_WRITE", 5),
+        )
+
+
+def get_read_context(scopes):
+    """
+    primary_reads() if a scope changed within REPLICA_READ_AFTER_WRITE.
+    """
+    if db_router.has_replica() and get_cache().get_many([get_written_key(scope) for scope in scopes]):
+        return db_router.primary_reads()
+    return contextlib.nullcontext()
+
+
+def get_key(request, scopes, variant=""):
+    versions = ":".join(get_versions(scopes))
+    user_id = getattr(request.user, "pk", None)
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f"response:{versions}:{user_id}:{variant}:{path}"
+
+
+def get_scopes(templates, request, kwargs):
+    return [template.format(user=request.user, **kwargs) for template in templates]
+
+
+def not_modified(request, etag):
+    if etag and etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return response
+    return None
+
+
+def cache_response(*scopes, timeout=None):
+    """
+    Cache successful GET responses of a view method, per user and full path.
+
+        @cache_response("posts:{user.pk}")
+        def list(self, request, *args, **kwargs): ...
+
+    Scopes are formatted with `user` (request.user) and the URL kwargs, and
+    are dropped with invalidate(), usually from post_save/post_delete
+    receivers. Works on DRF view methods (the response data is cached and
+    rendered again for the negotiated format) and on async Django view
+    methods (the rendered content is cached). A cached ETag answers
+    If-None-Match with a 304.
+    """
+    if timeout is None:
+        timeout = getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300)
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @functools.wraps(view)
+            async def async_wrapper(self, request, *args, **kwargs):
+                formatted = get_scopes(scopes, request, kwargs)
+                key = await sync_to_async(get_key)(request, formatted)
+                cached = await sync_to_async(get_cache().get)(key)
+                if cached is not None:
+                    content, content_type, etag = cached
+                    response = not_modified(request, etag) or HttpResponse(content, content_type=content_type)
+                    if etag:
+                        response["ETag"] = etag
+                    return response
+                with await sync_to_async(get_read_context)(formatted):
+                    response = await view(self, request, *args, **kwargs)
+                if response.status_code == 200 and not response.streaming:
+                    value = (response.content, response["Content-Type"], response.get("ETag"))
+                    await sync_to_async(get_cache().set)(key, value, timeout)
+                return response
+            return async_wrapper
+
+        @functools.wraps(view)
+        def wrapper(self, request, *args, **kwargs):
+            variant = request.accepted_renderer.format
+            formatted = get_scopes(scopes, request, kwargs)
+            key = get_key(request, formatted, variant)
+            cached = get_cache().get(key)
+            if cached is not None:
+                data, etag = cached
+                response = not_modified(request, etag) or Response(data)
+                if etag:
+                    response["ETag"] = etag
+                return response
+            with get_read_context(formatted):
+                response = view(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                get_cache().set(key, (response.data, response.get("ETag")), timeout)
+            return response
+        return wrapper
+
+    return decorator
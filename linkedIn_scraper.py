@@ -1,137 +1,140 @@
-from linkedin_scraper import actions
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import time
-import json
+"""
+Scrape LinkedIn job searches across a pool of headless browsers.
 
-# === Configuration ===
-email = "hanzala0877@gmail.com"
-password = "hanzala@123"
-search_query = "Machine Learning Engineer"
-location = "Pakistan"
-
-# === Initialize Driver ===
-options = webdriver.ChromeOptions()
-# options.add_argument("--headless")  # Uncomment for headless
-driver = webdriver.Chrome(options=options)
-
-try:
-    # === Step 1: Login via linkedin_scraper ===
-    print("Logging in...")
-    actions.login(driver, email, password)
-    print("Login successful.")
-
-    # === Step 2: Navigate to job search ===
-    url = (
-        f"https://www.linkedin.com/jobs/search/?"
-        f"keywords={search_query.replace(' ', '%20')}&"
-        f"location={location.replace(' ', '%20')}&"
-        f"refresh=true"
-    )
-    driver.get(url)
-    time.sleep(5)
+    LINKEDIN_EMAIL=... LINKEDIN_PASSWORD=... python linkedIn_scraper.py \
+        --search "Machine Learning Engineer|Pakistan" \
+        --search "Data Scientist|Remote" --workers 3
+
+Sessions are saved per account in --sessions-dir and reused, so browsers only
+log in when a saved session has expired. --accounts-file takes a JSON list of
+{"email": ..., "password": ...} objects to spread the browsers over several
+accounts.
+
+Progress is saved to --checkpoint after every page; running the same command
+again resumes where an interrupted run stopped.
+
+With --seen-file (and optionally --seen-from-db) job ids collected by earlier
+runs are skipped, and a search stops at the first page with nothing new.
 
-    # Wait for job cards to appear
-    WebDriverWait(driver, 15).until(
-        EC.presence_of_element_located((By.CSS_SELECTOR, "li[data-occludable-job-id]"))
+Jobs are appended to --output as they are parsed: JSON lines by default, CSV
+for a .csv path, gzip-compressed when the path ends in .gz, or straight into
+the jobs table with --output db.
+
+Pages saved with --save-html can be re-parsed later without a browser:
+
+    python linkedIn_scraper.py --offline pages/*.html
+"""
+import argparse
+import json
+import logging
+import os
+
+from scraper.engine import ScrapeEngine, SearchJob
+from scraper.extract import parse_html
+from scraper.seen import SeenJobs
+from scraper.session import SessionStore
+from scraper.sinks import open_sink
+
+DEFAULT_SEARCH = "Machine Learning Engineer|Pakistan"
+
+
+def parse_search(value):
+    query, _, location = value.partition("|")
+    return SearchJob(query.strip(), location.strip())
+
+
+def read_searches(path):
+    # one "query|location" per line
+    with open(path, encoding="utf-8") as f:
+        return [parse_search(line) for line in f if line.strip()]
+
+
+def read_accounts(path):
+    if path:
+        with open(path, encoding="utf-8") as f:
+            return [(account["email"], account["password"]) for account in json.load(f)]
+    return [(os.environ["LINKEDIN_EMAIL"], os.environ["LINKEDIN_PASSWORD"])]
+
+
+def setup_django():
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    django.setup()
+
+
+def parse_saved_pages(paths, sink):
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for job in parse_html(f.read()):
+                sink.write(job)
+        sink.flush()
+    return sink.count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--search", action="append", default=[], help='"query|location", repeatable')
+    parser.add_argument("--searches-file", help='File with one "query|location" per line')
+    parser.add_argument("--workers", type=int, default=2, help="Number of browsers")
+    parser.add_argument("--max-pages", type=int, default=5, help="Result pages per search")
+    parser.add_argument("--checkpoint", default="scraper_checkpoint.json")
+    parser.add_argument("--output", default="linkedin_ml_jobs_pakistan.jsonl",
+                        help="Appended to: .jsonl, .csv (add .gz to compress) or db for the jobs table")
+    parser.add_argument("--accounts-file", help="JSON list of {email, password}")
+    parser.add_argument("--sessions-dir", default="scraper_sessions", help="Saved browser sessions")
+    parser.add_argument("--headed", action="store_true", help="Show the browsers")
+    parser.add_argument("--save-html", metavar="DIR", help="Also save every results page to DIR")
+    parser.add_argument("--seen-file", help="Skip job ids listed in this file and append new ones")
+    parser.add_argument("--seen-from-db", action="store_true", help="Also skip jobs already in the database")
+    parser.add_argument("--offline", nargs="+", metavar="HTML", help="Parse saved pages instead of scraping")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(threadName)s %(message)s")
+
+    if args.output == "db" or args.seen_from_db:
+        setup_django()
+
+    with open_sink(args.output) as sink:
+        if args.offline:
+            count = parse_saved_pages(args.offline, sink)
+        else:
+            count = scrape(args, sink)
+
+    print(f"\nSuccessfully extracted {count} jobs to {args.output}.")
+
+
+def scrape(args, sink):
+    searches = [parse_search(value) for value in args.search]
+    if args.searches_file:
+        searches += read_searches(args.searches_file)
+    if not searches:
+        searches = [parse_search(DEFAULT_SEARCH)]
+
+    seen = None
+    if args.seen_from_db:
+        seen = SeenJobs.from_database(args.seen_file)
+    elif args.seen_file:
+        seen = SeenJobs(args.seen_file)
+
+    engine = ScrapeEngine(
+        searches,
+        read_accounts(args.accounts_file),
+        sink,
+        workers=args.workers,
+        max_pages=args.max_pages,
+        headless=not args.headed,
+        checkpoint_path=args.checkpoint,
+        save_html_dir=args.save_html,
+        seen=seen,
+        sessions=SessionStore(args.sessions_dir),
     )
+    try:
+        return engine.run()
+    finally:
+        if seen is not None:
+            seen.close()
+
 
-    # === Step 3: Scroll to load more jobs ===
-    print("Loading job listings...")
-    scroll_pause = 2
-    last_height = driver.execute_script("return document.body.scrollHeight")
-
-    for _ in range(5):
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(scroll_pause)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            break
-        last_height = new_height
-
-    # === Step 4: Parse job cards using exact structure from your HTML ===
-    job_cards = driver.find_elements(By.CSS_SELECTOR, "li[data-occludable-job-id]")
-    print(f"Found {len(job_cards)} job cards.")
-
-    jobs = []
-
-    for card in job_cards:
-        try:
-            # Extract job ID
-            job_id = card.get_attribute("data-occludable-job-id")
-
-            # Title & link
-            title_elem = card.find_element(By.CSS_SELECTOR, "a.job-card-container__link[aria-label]")
-            title = title_elem.get_attribute("aria-label")
-            job_url = title_elem.get_attribute("href")
-
-            # Company name
-            company = ""
-            try:
-                company_elem = card.find_element(By.CSS_SELECTOR, ".artdeco-entity-lockup__subtitle span")
-                company = company_elem.text.strip()
-            except:
-                pass
-
-            # Location
-            location_text = ""
-            try:
-                loc_elem = card.find_element(By.CSS_SELECTOR, ".job-card-container__metadata-wrapper li span")
-                location_text = loc_elem.text.strip()
-            except:
-                pass
-
-            # Posted time
-            posted_time = ""
-            try:
-                time_elem = card.find_element(By.CSS_SELECTOR, "time")
-                posted_time = time_elem.text.strip()
-            except:
-                pass
-
-            # Easy Apply?
-            easy_apply = False
-            try:
-                card.find_element(By.XPATH, ".//span[contains(text(), 'Easy Apply')]")
-                easy_apply = True
-            except NoSuchElementException:
-                pass
-
-            # Actively reviewing?
-            actively_reviewing = False
-            try:
-                card.find_element(By.XPATH, ".//span[contains(text(), 'Actively reviewing applicants')]")
-                actively_reviewing = True
-            except NoSuchElementException:
-                pass
-
-            jobs.append({
-                "job_id": job_id,
-                "title": title,
-                "company": company,
-                "location": location_text,
-                "posted": posted_time,
-                "easy_apply": easy_apply,
-                "actively_reviewing": actively_reviewing,
-                "job_url": job_url
-            })
-
-        except Exception as e:
-            print(f"Skipping a card due to error: {e}")
-            continue
-
-    # === Step 5: Output Results ===
-    print(f"\nSuccessfully extracted {len(jobs)} jobs.\n")
-    for job in jobs[:3]:  # Preview first 3
-        print(json.dumps(job, indent=2))
-
-    # Save full results
-    with open("linkedin_ml_jobs_pakistan.json", "w", encoding="utf-8") as f:
-        json.dump(jobs, f, indent=2, ensure_ascii=False)
-
-finally:
-    input("\nPress Enter to close browser...")
-    driver.quit()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import json
+import os
+import threading
+
+
+class Checkpoint:
+    """
+    Progress of a scrape, rewritten after every page so an interrupted run
+    resumes at the next unscraped page instead of from zero. The jobs
+    themselves go to the run's sink before their page is recorded here.
+    Once every search is done the engine clears it, so the next run starts
+    over.
+
+    File layout: {"progress": {key: {"next_page": n, "done": bool}}}
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self.state = {"progress": {}}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.state = json.load(f)
+
+    def next_page(self, key):
+        return self.state["progress"].get(key, {}).get("next_page", 0)
+
+    def is_done(self, key):
+        return self.state["progress"].get(key, {}).get("done", False)
+
+    def record_page(self, key, page, done=False):
+        with self._lock:
+            self.state["progress"][key] = {"next_page": page + 1, "done": done}
+            self.save()
+
+    def mark_done(self, key):
+        with self._lock:
+            self.state["progress"].setdefault(key, {"next_page": 0})["done"] = True
+            self.save()
+
+    def clear(self):
+        with self._lock:
+            self.state = {"progress": {}}
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
+
+    def save(self):
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"progress": self.state["progress"]}, f)
+        os.replace(tmp_path, self.path)
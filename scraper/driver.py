@@ -0,0 +1,16 @@
+from linkedin_scraper import actions
+from selenium import webdriver
+
+
+def make_driver(headless=True):
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    return webdriver.Chrome(options=options)
+
+
+def login(driver, email, password):
+    actions.login(driver, email, password)
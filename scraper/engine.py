@@ -0,0 +1,174 @@
+import logging
+import os
+import queue
+import threading
+from dataclasses import dataclass
+from urllib.parse import urlencode
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from scraper import driver as drivers
+from scraper.checkpoint import Checkpoint
+from scraper.extract import JOB_CARD_SELECTOR, card_ids, extract_cards, load_all_cards
+from scraper.session import SessionExpired, SessionStore, check_session, ensure_session
+
+logger = logging.getLogger(__name__)
+
+SEARCH_URL = "https://www.linkedin.com/jobs/search/"
+# LinkedIn serves search results 25 cards at a time (&start=0, 25, 50, ...)
+PAGE_SIZE = 25
+
+
+@dataclass(frozen=True)
+class SearchJob:
+    query: str
+    location: str
+
+    @property
+    def key(self):
+        return f"{self.query}|{self.location}"
+
+    def url(self, page=0, newest_first=False):
+        params = {
+            "keywords": self.query,
+            "location": self.location,
+            "start": page * PAGE_SIZE,
+            "refresh": "true",
+        }
+        if newest_first:
+            params["sortBy"] = "DD"
+        return f"{SEARCH_URL}?{urlencode(params)}"
+
+
+class ScrapeEngine:
+    """
+    Runs a list of SearchJobs across a pool of headless Chrome drivers.
+
+    Each worker thread owns one warm driver for one of `accounts` ((email,
+    password) pairs, assigned round-robin) and pulls searches from a shared
+    queue. Sessions are restored from `sessions` (a SessionStore) and a
+    worker only logs in when its session has expired, also mid-run.
+    Progress is checkpointed per page; a search that fails or is interrupted
+    is resumed from its next page on the next run.
+
+    Jobs are written to `sink` (scraper.sinks) card by card and flushed
+    before the page is checkpointed, so nothing is held in memory and a crash
+    loses at most the page in progress (which is scraped again on resume).
+
+    With a `seen` set (scraper.seen.SeenJobs) results are sorted newest first,
+    only unseen cards are extracted, and a search stops at the first page
+    whose cards were all seen before.
+    """
+
+    def __init__(self, jobs, accounts, sink, workers=2, max_pages=5,
+                 headless=True, checkpoint_path=None, wait_timeout=15, save_html_dir=None,
+                 seen=None, sessions=None):
+        self.jobs = list(jobs)
+        self.accounts = list(accounts)
+        self.sink = sink
+        self.sessions = sessions if sessions is not None else SessionStore()
+        self.workers = workers
+        self.max_pages = max_pages
+        self.headless = headless
+        self.wait_timeout = wait_timeout
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.seen = seen
+        # keep every results page for re-parsing offline with extract.parse_html
+        self.save_html_dir = save_html_dir
+        if save_html_dir:
+            os.makedirs(save_html_dir, exist_ok=True)
+
+    def run(self):
+        pending = queue.Queue()
+        for job in self.jobs:
+            if not self.checkpoint.is_done(job.key):
+                pending.put(job)
+        logger.info("%d of %d searches left to scrape.", pending.qsize(), len(self.jobs))
+
+        threads = [
+            threading.Thread(
+                target=self.worker,
+                args=(pending, self.accounts[i % len(self.accounts)]),
+                name=f"scraper-{i}",
+            )
+            for i in range(min(self.workers, pending.qsize()))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if all(self.checkpoint.is_done(job.key) for job in self.jobs):
+            # finished: the next (e.g. daily incremental) run scrapes again
+            self.checkpoint.clear()
+        return self.sink.count
+
+    def worker(self, pending, account):
+        email, password = account
+        driver = drivers.make_driver(headless=self.headless)
+        try:
+            if ensure_session(driver, self.sessions, email, password):
+                logger.info("Logged in as %s.", email)
+            while True:
+                try:
+                    job = pending.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    try:
+                        self.scrape(driver, job)
+                    except SessionExpired:
+                        logger.info("Session of %s expired, logging in again.", email)
+                        ensure_session(driver, self.sessions, email, password)
+                        self.scrape(driver, job)
+                except Exception:
+                    logger.exception("Search %r failed, it will resume on the next run.", job.key)
+        finally:
+            driver.quit()
+
+    def scrape(self, driver, job):
+        for page in range(self.checkpoint.next_page(job.key), self.max_pages):
+            card_count, jobs = self.scrape_page(driver, job, page)
+            # card_count is None when every card on the page was seen before
+            last_page = card_count is None or card_count < PAGE_SIZE or page + 1 == self.max_pages
+            self.sink.flush()
+            self.checkpoint.record_page(job.key, page, done=last_page)
+            logger.info("%s page %d: %d jobs.", job.key, page, len(jobs))
+            if last_page:
+                return
+        self.checkpoint.mark_done(job.key)
+
+    def scrape_page(self, driver, job, page):
+        driver.get(job.url(page, newest_first=self.seen is not None))
+        check_session(driver)
+        try:
+            WebDriverWait(driver, self.wait_timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, JOB_CARD_SELECTOR))
+            )
+        except TimeoutException:
+            check_session(driver)
+            return 0, []
+
+        wanted = None
+        if self.seen is not None:
+            wanted = self.seen.unseen(card_ids(driver))
+            if not wanted:
+                return None, []
+
+        card_count = load_all_cards(driver)
+        if self.save_html_dir:
+            self.save_html(driver, job, page)
+        jobs = extract_cards(driver, wanted)
+        for record in jobs:
+            self.sink.write(record)
+        if self.seen is not None:
+            self.seen.add_many(record["job_id"] for record in jobs)
+        return card_count, jobs
+
+    def save_html(self, driver, job, page):
+        name = "".join(c if c.isalnum() else "_" for c in job.key)
+        path = os.path.join(self.save_html_dir, f"{name}_{page}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(driver.page_source)
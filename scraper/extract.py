@@ -0,0 +1,124 @@
+import json
+from urllib.parse import urljoin
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+JOB_CARD_SELECTOR = "li[data-occludable-job-id]"
+LINKEDIN_URL = "https://www.linkedin.com"
+
+# Ids are on every card, rendered or occluded, so they can be read before
+# scrolling.
+CARD_IDS_JS = """
+return Array.from(document.querySelectorAll(arguments[0]), (card) =>
+    card.getAttribute("data-occludable-job-id"));
+"""
+
+# Extracts every card on the page in a single WebDriver round-trip, instead of
+# up to eight find_element/get_attribute calls per card. arguments[1] is an
+# optional list of the job ids to extract.
+EXTRACT_CARDS_JS = """
+const text = (card, selector) => {
+    const node = card.querySelector(selector);
+    return node ? node.textContent.trim() : "";
+};
+const hasLabel = (card, label) =>
+    Array.from(card.querySelectorAll("span")).some((span) => span.textContent.includes(label));
+
+const wanted = arguments[1] ? new Set(arguments[1]) : null;
+const jobs = [];
+for (const card of document.querySelectorAll(arguments[0])) {
+    if (wanted && !wanted.has(card.getAttribute("data-occludable-job-id"))) {
+        continue;
+    }
+    const link = card.querySelector("a.job-card-container__link[aria-label]");
+    if (!link) {
+        continue;  // occluded card that was never rendered
+    }
+    jobs.push({
+        job_id: card.getAttribute("data-occludable-job-id"),
+        title: link.getAttribute("aria-label"),
+        company: text(card, ".artdeco-entity-lockup__subtitle span"),
+        location: text(card, ".job-card-container__metadata-wrapper li span"),
+        posted: text(card, "time"),
+        easy_apply: hasLabel(card, "Easy Apply"),
+        actively_reviewing: hasLabel(card, "Actively reviewing applicants"),
+        job_url: link.href,
+    });
+}
+return JSON.stringify(jobs);
+"""
+
+
+def find_cards(driver):
+    return driver.find_elements(By.CSS_SELECTOR, JOB_CARD_SELECTOR)
+
+
+def load_all_cards(driver, timeout=5, max_rounds=20):
+    """
+    Scroll the last card into view until the list stops growing. Waits for
+    new cards explicitly instead of sleeping a fixed time. Returns the number
+    of cards on the page.
+    """
+    count = len(find_cards(driver))
+    for _ in range(max_rounds):
+        cards = find_cards(driver)
+        if not cards:
+            break
+        driver.execute_script("arguments[0].scrollIntoView({block: 'end'});", cards[-1])
+        try:
+            WebDriverWait(driver, timeout).until(lambda d: len(find_cards(d)) > count)
+        except TimeoutException:
+            break
+        count = len(find_cards(driver))
+    return count
+
+
+def card_ids(driver):
+    return driver.execute_script(CARD_IDS_JS, JOB_CARD_SELECTOR)
+
+
+def extract_cards(driver, job_ids=None):
+    """
+    Every card's fields, or only those of `job_ids` when given.
+    """
+    return json.loads(driver.execute_script(EXTRACT_CARDS_JS, JOB_CARD_SELECTOR, job_ids))
+
+
+def _xpath_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _first_text(nodes):
+    return nodes[0].text_content().strip() if nodes else ""
+
+
+def parse_html(html):
+    """
+    Offline counterpart of extract_cards(): parse a saved search results page
+    with lxml and return the same job dicts.
+    """
+    try:
+        from lxml import html as lxml_html
+    except ImportError:
+        raise ImportError("Offline parsing needs lxml: pip install lxml")
+
+    document = lxml_html.fromstring(html)
+    jobs = []
+    for card in document.xpath("//li[@data-occludable-job-id]"):
+        links = card.xpath(f".//a[{_xpath_class('job-card-container__link')} and @aria-label]")
+        if not links:
+            continue
+        link = links[0]
+        jobs.append({
+            "job_id": card.get("data-occludable-job-id"),
+            "title": link.get("aria-label"),
+            "company": _first_text(card.xpath(f".//*[{_xpath_class('artdeco-entity-lockup__subtitle')}]//span")),
+            "location": _first_text(card.xpath(f".//*[{_xpath_class('job-card-container__metadata-wrapper')}]//li//span")),
+            "posted": _first_text(card.xpath(".//time")),
+            "easy_apply": bool(card.xpath(".//span[contains(., 'Easy Apply')]")),
+            "actively_reviewing": bool(card.xpath(".//span[contains(., 'Actively reviewing applicants')]")),
+            "job_url": urljoin(LINKEDIN_URL, link.get("href", "")),
+        })
+    return jobs
@@ -0,0 +1,51 @@
+import os
+import threading
+
+
+class SeenJobs:
+    """
+    Job ids already collected. Loaded from a compact local file (one id per
+    line) and/or the jobs table; ids scraped during the run are appended to
+    the file so the next run skips them too.
+    """
+
+    def __init__(self, path=None, ids=()):
+        self.path = path
+        self._ids = set(ids)
+        self._lock = threading.Lock()
+        self._file = None
+        if path:
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    self._ids.update(line.strip() for line in f if line.strip())
+            self._file = open(path, "a", encoding="utf-8")
+
+    @classmethod
+    def from_database(cls, path=None):
+        """
+        Seed from apps.jobs; needs Django to be set up.
+        """
+        from apps.jobs.models import Job
+
+        return cls(path, Job.objects.values_list("job_id", flat=True).iterator())
+
+    def __contains__(self, job_id):
+        return job_id in self._ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def unseen(self, job_ids):
+        return [job_id for job_id in job_ids if job_id not in self._ids]
+
+    def add_many(self, job_ids):
+        with self._lock:
+            new_ids = [job_id for job_id in job_ids if job_id not in self._ids]
+            self._ids.update(new_ids)
+            if self._file and new_ids:
+                self._file.write("".join(f"{job_id}\n" for job_id in new_ids))
+                self._file.flush()
+
+    def close(self):
+        if self._file:
+            self._file.close()
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from scraper import driver as drivers
+
+LINKEDIN_URL = "https://www.linkedin.com"
+FEED_URL = f"{LINKEDIN_URL}/feed/"
+# any cheap page on the domain, cookies can only be set for the current one
+COOKIE_URL = f"{LINKEDIN_URL}/robots.txt"
+LOGGED_OUT_MARKERS = ("/login", "/authwall", "/checkpoint", "/uas/")
+
+
+class SessionExpired(Exception):
+    pass
+
+
+def is_logged_out_url(url):
+    return any(marker in url for marker in LOGGED_OUT_MARKERS)
+
+
+def check_session(driver):
+    """
+    Raise SessionExpired if LinkedIn bounced the last navigation to a login page.
+    """
+    if is_logged_out_url(driver.current_url):
+        raise SessionExpired(driver.current_url)
+
+
+def is_logged_in(driver, timeout=10):
+    driver.get(FEED_URL)
+    try:
+        WebDriverWait(driver, timeout).until(
+            lambda d: "/feed" in d.current_url or is_logged_out_url(d.current_url)
+        )
+    except TimeoutException:
+        return False
+    return "/feed" in driver.current_url
+
+
+class SessionStore:
+    """
+    Saved browser sessions, one JSON profile per account holding its cookies
+    and localStorage. Profiles grant access to the account: the directory is
+    created private and must not be committed.
+    """
+
+    def __init__(self, directory="scraper_sessions"):
+        self.directory = directory
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    def path(self, email):
+        name = hashlib.sha256(email.lower().encode()).hexdigest()[:16]
+        return os.path.join(self.directory, f"{name}.json")
+
+    def save(self, driver, email):
+        profile = {
+            "cookies": driver.get_cookies(),
+            "local_storage": driver.execute_script("return Object.assign({}, window.localStorage);"),
+        }
+        path = self.path(email)
+        tmp_path = f"{path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(profile, f)
+        os.replace(tmp_path, path)
+
+    def restore(self, driver, email):
+        """
+        Load the saved profile into `driver`. Returns True if it is still
+        logged in.
+        """
+        path = self.path(email)
+        if not os.path.exists(path):
+            return False
+        with open(path, encoding="utf-8") as f:
+            profile = json.load(f)
+
+        driver.get(COOKIE_URL)
+        for cookie in profile["cookies"]:
+            if "expiry" in cookie:
+                cookie["expiry"] = int(cookie["expiry"])
+            driver.add_cookie(cookie)
+        driver.execute_script(
+            "for (const [key, value] of Object.entries(arguments[0])) {"
+            " window.localStorage.setItem(key, value); }",
+            profile["local_storage"],
+        )
+        return is_logged_in(driver)
+
+
+def ensure_session(driver, store, email, password):
+    """
+    Reuse the account's saved session, logging in (and saving the new
+    session) only when it is missing or expired. Returns True if a login was
+    needed.
+    """
+    if store is not None and store.restore(driver, email):
+        return False
+    drivers.login(driver, email, password)
+    if store is not None:
+        store.save(driver, email)
+    return True
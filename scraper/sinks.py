@@ -0,0 +1,137 @@
+import csv
+import gzip
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+
+FIELDS = [
+    "job_id",
+    "title",
+    "company",
+    "location",
+    "posted",
+    "easy_apply",
+    "actively_reviewing",
+    "job_url",
+]
+
+
+def open_text(path, compress=None):
+    """
+    Open `path` for appending; gzip when asked or when it ends in .gz.
+    Appending to a gzip file adds a member, which gzip readers handle.
+    """
+    if compress is None:
+        compress = path.endswith(".gz")
+    if compress:
+        return gzip.open(path, "at", encoding="utf-8", newline="")
+    return open(path, "a", encoding="utf-8", newline="")
+
+
+class Sink(ABC):
+    """
+    Destination for scraped jobs. write() is called once per card as soon
+    as it is parsed, flush() once per results page; safe to share between
+    engine workers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def write(self, record):
+        with self._lock:
+            self._write(record)
+            self.count += 1
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @abstractmethod
+    def _write(self, record):
+        pass
+
+    def _flush(self):
+        pass
+
+    def _close(self):
+        pass
+
+
+class JsonlSink(Sink):
+    def __init__(self, path, compress=None):
+        super().__init__()
+        self.file = open_text(path, compress)
+
+    def _write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _flush(self):
+        self.file.flush()
+
+    def _close(self):
+        self.file.close()
+
+
+class CsvSink(Sink):
+    def __init__(self, path, compress=None):
+        super().__init__()
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open_text(path, compress)
+        self.writer = csv.DictWriter(self.file, fieldnames=FIELDS, extrasaction="ignore")
+        if is_new:
+            self.writer.writeheader()
+
+    def _write(self, record):
+        self.writer.writerow(record)
+
+    def _flush(self):
+        self.file.flush()
+
+    def _close(self):
+        self.file.close()
+
+
+class DatabaseSink(Sink):
+    """
+    Upserts into apps.jobs, one INSERT ... ON CONFLICT per page. Needs Django
+    to be set up.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.buffer = []
+
+    def _write(self, record):
+        self.buffer.append(record)
+
+    def _flush(self):
+        from apps.jobs.importer import upsert_batch
+
+        if self.buffer:
+            upsert_batch(self.buffer)
+            self.buffer = []
+
+
+def open_sink(target):
+    """
+    "db" → DatabaseSink; *.csv[.gz] → CsvSink; anything else → JsonlSink.
+    """
+    if target == "db":
+        return DatabaseSink()
+    if target.endswith((".csv", ".csv.gz")):
+        return CsvSink(target)
+    return JsonlSink(target)